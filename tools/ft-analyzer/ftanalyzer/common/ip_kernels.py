@@ -0,0 +1,101 @@
+"""
+Author(s): Jan Sobol <sobol@cesnet.cz>
+
+Copyright: (C) 2024 CESNET, z.s.p.o.
+SPDX-License-Identifier: BSD-3-Clause
+
+Kernels for subnet membership tests over integer IP address columns.
+
+A CIDR membership test reduces to a masked integer compare '(ip & netmask) == network'.
+When numba is installed, the compare runs as a JIT-compiled parallel loop which releases
+the GIL and scales across cores; otherwise a vectorized NumPy expression is used.
+numba is an optional accelerator, not a project dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+def _in_subnet_v4(addr_lo: np.ndarray, is_v6: np.ndarray, net_lo: np.uint64, mask_lo: np.uint64) -> np.ndarray:
+    out = np.empty(addr_lo.size, dtype=np.bool_)
+    # pylint: disable=not-an-iterable
+    for i in prange(addr_lo.size):
+        out[i] = (not is_v6[i]) and (addr_lo[i] & mask_lo) == net_lo
+    return out
+
+
+def _in_subnet_v6(
+    addr_hi: np.ndarray,
+    addr_lo: np.ndarray,
+    is_v6: np.ndarray,
+    net_hi: np.uint64,
+    net_lo: np.uint64,
+    mask_hi: np.uint64,
+    mask_lo: np.uint64,
+) -> np.ndarray:
+    out = np.empty(addr_lo.size, dtype=np.bool_)
+    # pylint: disable=not-an-iterable
+    for i in prange(addr_lo.size):
+        out[i] = is_v6[i] and (addr_hi[i] & mask_hi) == net_hi and (addr_lo[i] & mask_lo) == net_lo
+    return out
+
+
+if _NUMBA_AVAILABLE:
+    _in_subnet_v4 = njit(parallel=True, cache=True)(_in_subnet_v4)
+    _in_subnet_v6 = njit(parallel=True, cache=True)(_in_subnet_v6)
+
+
+def in_subnet(
+    addr_hi: np.ndarray,
+    addr_lo: np.ndarray,
+    is_v6: np.ndarray,
+    network: int,
+    netmask: int,
+    version: int,
+) -> np.ndarray:
+    """Test which addresses belong to a subnet given their integer limb representation.
+
+    Parameters
+    ----------
+    addr_hi : np.ndarray
+        High 64 bits of the addresses (zero for IPv4).
+    addr_lo : np.ndarray
+        Low 64 bits of the addresses (uint32 value for IPv4).
+    is_v6 : np.ndarray
+        Boolean flags marking IPv6 addresses.
+    network : int
+        Integer value of the subnet network address.
+    netmask : int
+        Integer value of the subnet netmask.
+    version : int
+        IP version of the subnet (4 or 6).
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of addresses belonging to the subnet.
+    """
+
+    net_hi, net_lo = divmod(network, 1 << 64)
+    mask_hi, mask_lo = divmod(netmask, 1 << 64)
+
+    if version == 6:
+        if _NUMBA_AVAILABLE:
+            return _in_subnet_v6(
+                addr_hi, addr_lo, is_v6, np.uint64(net_hi), np.uint64(net_lo), np.uint64(mask_hi), np.uint64(mask_lo)
+            )
+        return (
+            is_v6
+            & ((addr_hi & np.uint64(mask_hi)) == np.uint64(net_hi))
+            & ((addr_lo & np.uint64(mask_lo)) == np.uint64(net_lo))
+        )
+
+    if _NUMBA_AVAILABLE:
+        return _in_subnet_v4(addr_lo, is_v6, np.uint64(net_lo), np.uint64(mask_lo))
+    return ~is_v6 & ((addr_lo & np.uint64(mask_lo)) == np.uint64(net_lo))
@@ -6,10 +6,9 @@ SPDX-License-Identifier: BSD-3-Clause
 
 """
 
-import operator
-from functools import reduce
 from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 from ftanalyzer.models.sm_data_types import SMSubnetSegment, SMTimeSegment
 from ftanalyzer.models.statistical_model import StatisticalModel
@@ -117,15 +116,22 @@ class PreciseModel(StatisticalModel):
         if segments is None:
             segments = [None]
 
-        # precise model compares IP addresses, so the same format is required
-        if self._flows_ip_addresses_converted != self._ref_ip_addresses_converted:
-            self._convert_ip_addresses()
-
-        all_flow_masks = []
+        covered = np.zeros(self._flows.shape[0], dtype=bool)
+        all_covered = False
         for segment in segments:
             self._report.add_segment(segment)
             flows, refs, mask_flow = self._filter_segment(segment)
-            all_flow_masks.append(mask_flow)
+            if mask_flow is None:
+                # segment without restrictions covers the whole data
+                all_covered = True
+            else:
+                if not isinstance(mask_flow, np.ndarray):
+                    mask_flow = mask_flow.to_numpy(dtype=bool)
+                np.logical_or(covered, mask_flow, out=covered)
+
+            # integer IP columns cached by the subnet filter must not reach PMFlow
+            flows = self._strip_ip_helper_columns(flows)
+            refs = self._strip_ip_helper_columns(refs)
 
             # perform outer join thank to which we can easily identify flows
             # which are in one frame and not the other using '_merge' column
@@ -156,9 +162,10 @@ class PreciseModel(StatisticalModel):
 
         if check_complement:
             self._report.add_segment("COMPLEMENT OF SEGMENTS")
-            # pylint: disable=invalid-unary-operand-type
-            flows = self._flows[~(reduce(operator.or_, all_flow_masks))].reset_index(drop=True)
-            self._report_flows(flows, PMTestCategory.UNEXPECTED)
+            if not all_covered:
+                # keep original indexes as the 'index' column expected by '_report_flows'
+                flows = self._flows[~covered].reset_index()
+                self._report_flows(self._strip_ip_helper_columns(flows), PMTestCategory.UNEXPECTED)
 
         return self._report
 
@@ -30,10 +30,13 @@ class SMMetricType(Enum):
     DURATION = "DURATION"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SMSubnetSegment(YAMLWizard):
     """Describe subnets which will be used to filter flows before computing metrics in a statistical model.
 
+    Instances are immutable and hashable, so they can be compared with the
+    dataclass-generated equality and used directly as cache keys.
+
     Attributes
     ----------
     source : str, None
@@ -48,27 +51,6 @@ class SMSubnetSegment(YAMLWizard):
     dest: Optional[str] = None
     bidir: bool = False
 
-    def __eq__(self, other: "SMSubnetSegment") -> bool:
-        """Compare all attributes of the dataclass.
-
-        Parameters
-        ----------
-        other : SMSubnetSegment
-            The other segment to be compared with.
-
-        Returns
-        ------
-        bool
-            True if equal, False otherwise.
-        """
-
-        return (
-            isinstance(self, type(other))
-            and self.source == other.source
-            and self.dest == other.dest
-            and self.bidir == other.bidir
-        )
-
     def __str__(self) -> str:
         src_str = self.source or "ANY"
         dest_str = self.dest or "ANY"
@@ -76,7 +58,7 @@ class SMSubnetSegment(YAMLWizard):
         return f"{src_str} {sign} {dest_str}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SMTimeSegment(YAMLWizard):
     """Describe time interval which will be used to filter flows before computing metrics in a statistical model.
     Both start and end times are expected to be in the UTC time zone.
@@ -98,22 +80,6 @@ class SMTimeSegment(YAMLWizard):
     start: Optional[datetime] = None
     end: Optional[datetime] = None
 
-    def __eq__(self, other: "SMTimeSegment") -> bool:
-        """Compare start and end times of both segments.
-
-        Parameters
-        ----------
-        other : SMTimeSegment
-            The other segment to be compared with.
-
-        Returns
-        ------
-        bool
-            True if equal, False otherwise.
-        """
-
-        return isinstance(self, type(other)) and self.start == other.start and self.end == other.end
-
     def __str__(self) -> str:
         src_str = self.start or "ANY"
         dest_str = self.end or "ANY"
@@ -121,10 +87,13 @@ class SMTimeSegment(YAMLWizard):
         return f"{src_str} -> {dest_str}"
 
 
-@dataclass
+@dataclass(slots=True)
 class SMMetric(YAMLWizard):
     """Describe metric and its acceptable relative difference to evaluate data in the statistical model.
 
+    The difference is validated once at construction, keeping 'diff' a plain attribute
+    without property dispatch on every 'SMTestOutcome.is_passing' call.
+
     Attributes
     ----------
     key : SMMetricType
@@ -136,16 +105,8 @@ class SMMetric(YAMLWizard):
     key: SMMetricType
     diff: float
 
-    @property
-    def diff(self) -> float:
-        """Getter"""
-        return self._diff
-
-    @diff.setter
-    def diff(self, value: float) -> None:
-        if 0 <= value <= 1:
-            self._diff = value
-        else:
+    def __post_init__(self) -> None:
+        if not 0 <= self.diff <= 1:
             raise ValueError("Relative difference must be in range 0 - 1 (included)")
 
 
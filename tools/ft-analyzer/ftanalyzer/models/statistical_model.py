@@ -8,14 +8,17 @@ SPDX-License-Identifier: BSD-3-Clause
 
 import ipaddress
 import logging
-import operator
+import socket
 import time
-from functools import reduce
 from typing import List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from ftanalyzer.common.pandas_multiprocessing import PandasMultiprocessingHelper
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv
+import pyarrow.parquet
+from ftanalyzer.common.ip_kernels import in_subnet
 from ftanalyzer.models.sm_data_types import (
     SMException,
     SMMetric,
@@ -28,6 +31,24 @@ from ftanalyzer.models.sm_data_types import (
 from ftanalyzer.reports import StatisticalReport
 from src.generator.interface import GeneratorStats
 
+# frozen Arrow schema and reader options shared by all model constructions,
+# so repeated CSV loads do not rebuild them from Python dicts
+_ARROW_SCHEMA = pa.schema(
+    [
+        ("START_TIME", pa.uint64()),
+        ("END_TIME", pa.uint64()),
+        ("PROTOCOL", pa.uint8()),
+        ("SRC_IP", pa.string()),
+        ("DST_IP", pa.string()),
+        ("SRC_PORT", pa.uint16()),
+        ("DST_PORT", pa.uint16()),
+        ("PACKETS", pa.uint64()),
+        ("BYTES", pa.uint64()),
+    ]
+)
+_PA_READ_OPTS = pyarrow.csv.ReadOptions()
+_PA_CONVERT_OPTS = pyarrow.csv.ConvertOptions(column_types=_ARROW_SCHEMA)
+
 
 class StatisticalModel:
     """Statistical model reads flows obtained from a network probe and compares them with a provided reference.
@@ -60,6 +81,7 @@ class StatisticalModel:
     # pylint: disable=too-few-public-methods
     TIME_EPSILON = 1000
     FLOW_KEY = ["SRC_IP", "DST_IP", "SRC_PORT", "DST_PORT", "PROTOCOL"]
+    CODE_FLOW_KEY = ["SRC_IP_CODE", "DST_IP_CODE", "SRC_PORT", "DST_PORT", "PROTOCOL"]
     DIR_INVARIANT_FLOW_KEY = [
         "INV_SRC_IP",
         "INV_DST_IP",
@@ -79,6 +101,16 @@ class StatisticalModel:
         "BYTES": np.uint64,
     }
 
+    # helper columns attached to the frames by '_convert_ip_addresses_to_int'
+    IP_HELPER_COLUMNS = (
+        "SRC_IP_INT_HI",
+        "SRC_IP_INT_LO",
+        "SRC_IP_IS_V6",
+        "DST_IP_INT_HI",
+        "DST_IP_INT_LO",
+        "DST_IP_IS_V6",
+    )
+
     AGGREGATE_FLOWS = {
         "START_TIME": "min",
         "END_TIME": "max",
@@ -121,15 +153,11 @@ class StatisticalModel:
 
         try:
             logging.getLogger().debug("reading file with flows=%s", flows)
-            # ports could be empty in flows with protocol like ICMP
-            flows = pd.read_csv(flows, engine="pyarrow", dtype=self.CSV_COLUMN_TYPES)
-            flows["SRC_PORT"] = flows["SRC_PORT"].fillna(0)
-            flows["DST_PORT"] = flows["DST_PORT"].fillna(0)
-            self._flows: pd.DataFrame = flows.astype(self.CSV_COLUMN_TYPES)
+            self._flows: pd.DataFrame = self._drop_multicast(self._read_flows(flows))
 
             if isinstance(reference, str):
                 logging.getLogger().debug("reading file with references=%s", reference)
-                self._ref = pd.read_csv(reference, engine="pyarrow", dtype=self.CSV_COLUMN_TYPES)
+                self._ref = self._read_flows(reference)
             else:
                 self._ref = reference
         except Exception as err:
@@ -140,20 +168,29 @@ class StatisticalModel:
             self._ref["END_TIME"] = self._ref["END_TIME"] + stats.start_time
             
             # filter out flows that start before the start time
-            self._flows = self._flows[self._flows["START_TIME"] >= stats.start_time]
-            
+            # probe exports are usually roughly time-ordered - use a binary search
+            # for the boundary instead of a full column compare when they are
+            if self._flows["START_TIME"].is_monotonic_increasing:
+                first = self._flows["START_TIME"].searchsorted(stats.start_time, side="left")
+                self._flows = self._flows.iloc[first:]
+            else:
+                self._flows = self._flows[self._flows["START_TIME"] >= stats.start_time]
+
         #if stats.end_time > 0:
         #    # filter out flows that start before the end time
         #    self._flows = self._flows[self._flows["START_TIME"] <= stats.end_time]
             
-        self._filter_multicast()
+        self._flows.reset_index(drop=True, inplace=True)
 
         if merge:
             self._merge_flows(biflows_ts_correction)
             
         self._generator_stats: GeneratorStats = stats
+        self._ref_duration = (stats.end_time - stats.start_time + 1) / 1000
         self._flows_ip_addresses_converted = False
-        self._ref_ip_addresses_converted = isinstance(reference, pd.DataFrame)
+        self._ref_ip_addresses_converted = False
+        self._segment_cache = {}
+        self._membership_cache = {}
 
     def validate(self, rules: List[SMRule], check_complement: bool = False) -> StatisticalReport:
         """Evaluate data in the statistical model based on the provided evaluation rules.
@@ -179,35 +216,60 @@ class StatisticalModel:
         """
 
         report = StatisticalReport()
-        all_flow_masks = []
+        covered = np.zeros(self._flows.shape[0], dtype=bool)
+        all_covered = False
+        durations = {}
         for rule in rules:
             flows, ref, mask_flow = self._filter_segment(rule.segment)
-            all_flow_masks.append(mask_flow)
+            if mask_flow is None:
+                # rule without a segment covers the whole data
+                all_covered = True
+            else:
+                if not isinstance(mask_flow, np.ndarray):
+                    mask_flow = mask_flow.to_numpy(dtype=bool)
+                np.logical_or(covered, mask_flow, out=covered)
 
             # Check duplicated metrics.
             if len({m.key for m in rule.metrics}) != len(rule.metrics):
                 raise SMException(f"Rule contains duplicated metrics: {rule.metrics}")
 
-            duration = (flows["END_TIME"].max() - flows["START_TIME"].min()+1) / 1000
-            ref_duration = (self._generator_stats.end_time - self._generator_stats.start_time +1) / 1000
-            
+            # duration depends only on the segment, reuse it between rules sharing one
+            segment_key = self._segment_key(rule.segment)
+            duration = durations.get(segment_key)
+            if duration is None:
+                duration = (flows["END_TIME"].max() - flows["START_TIME"].min() + 1) / 1000
+                durations[segment_key] = duration
+            ref_duration = self._ref_duration
+
+            # sum raw NumPy buffers once per rule, skipping the Series reduce wrapper
+            bytes_sum = flows[SMMetricType.BYTES.value].to_numpy(copy=False).sum()
+            packets_sum = flows[SMMetricType.PACKETS.value].to_numpy(copy=False).sum()
+            n_flows = flows.shape[0]
+            n_ref = ref.shape[0]
+
             for metric in rule.metrics:
                 match metric.key:
                     case SMMetricType.FLOWS:
-                        value = len(flows.index)
-                        reference = len(ref.index)
+                        value = n_flows
+                        reference = n_ref
                     case SMMetricType.MBPS:
-                        value = flows[SMMetricType.BYTES.value].sum() / duration / pow(10, 6)
+                        value = bytes_sum / duration / pow(10, 6)
                         reference = self._generator_stats.bytes / ref_duration / pow(10, 6)
                     case SMMetricType.PPS:
-                        value = flows[SMMetricType.PACKETS.value].sum() / duration
+                        value = packets_sum / duration
                         reference = self._generator_stats.packets / ref_duration
                     case SMMetricType.DURATION:
                         value = duration
                         reference = ref_duration
+                    case SMMetricType.BYTES:
+                        value = bytes_sum
+                        reference = ref[metric.key.value].to_numpy(copy=False).sum()
+                    case SMMetricType.PACKETS:
+                        value = packets_sum
+                        reference = ref[metric.key.value].to_numpy(copy=False).sum()
                     case _:
-                        value = flows[metric.key.value].sum()
-                        reference = ref[metric.key.value].sum()                    
+                        value = flows[metric.key.value].to_numpy(copy=False).sum()
+                        reference = ref[metric.key.value].to_numpy(copy=False).sum()
 
                 report.add_test(
                     SMTestOutcome(
@@ -216,11 +278,14 @@ class StatisticalModel:
                 )
 
         if check_complement:
-            # pylint: disable=invalid-unary-operand-type
-            flows = self._flows[~(reduce(operator.or_, all_flow_masks))].reset_index(drop=True)
+            if all_covered:
+                # a segment-less rule covered everything, the complement is empty
+                flows = None
+            else:
+                flows = self._flows[~covered].reset_index(drop=True)
 
             for metric in [SMMetric(SMMetricType.PACKETS, 0), SMMetric(SMMetricType.BYTES, 0)]:
-                value = flows[metric.key.value].sum()
+                value = 0 if flows is None else flows[metric.key.value].sum()
                 reference = 0
 
                 report.add_test(
@@ -229,12 +294,59 @@ class StatisticalModel:
 
         return report
     
-    def _filter_multicast(self):
-        # ipv4
-        self._flows = self._flows[self._flows["DST_IP"] != "255.255.255.255"]
-        
-        #ipv6
-        self._flows = self._flows[~self._flows["DST_IP"].str.startswith("ff02::")]
+    @staticmethod
+    def _read_flows(path: str) -> pd.DataFrame:
+        """Read a file with flow records directly into an Arrow table and convert it to a DataFrame.
+
+        Files with the '.parquet' suffix are loaded by the Parquet reader, which
+        preserves column types and avoids text parsing entirely. Anything else is
+        read as CSV with column types enforced by the Arrow CSV reader itself, so
+        no fillna/astype round-trip over the materialized frame is needed. Ports
+        could be empty in flows with protocol like ICMP - nulls are filled at the
+        Arrow layer.
+
+        Parameters
+        ----------
+        path : str
+            Path to a CSV containing flow records.
+
+        Returns
+        ------
+        pd.DataFrame
+            Flow records backed by Arrow arrays.
+        """
+
+        if path.endswith(".parquet"):
+            return pyarrow.parquet.read_table(path).to_pandas(types_mapper=pd.ArrowDtype)
+
+        table = pyarrow.csv.read_csv(path, read_options=_PA_READ_OPTS, convert_options=_PA_CONVERT_OPTS)
+        for port in ("SRC_PORT", "DST_PORT"):
+            index = table.schema.get_field_index(port)
+            table = table.set_column(index, port, pc.fill_null(table.column(index), 0))
+
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    @staticmethod
+    def _drop_multicast(flows: pd.DataFrame) -> pd.DataFrame:
+        """Drop IPv4 broadcast and IPv6 link-local multicast flows.
+
+        The mask is computed once during CSV ingest with pyarrow string kernels
+        instead of a Python-level scan per StatisticalModel construction.
+
+        Parameters
+        ----------
+        flows : pd.DataFrame
+            Flow records acquired from a network probe.
+
+        Returns
+        ------
+        pd.DataFrame
+            Flows without multicast/broadcast destinations.
+        """
+
+        dst_ip = pa.array(flows["DST_IP"], type=pa.string())
+        is_mcast = pc.or_(pc.starts_with(dst_ip, "ff02::"), pc.equal(dst_ip, "255.255.255.255"))
+        return flows[~is_mcast.to_numpy(zero_copy_only=False)]
 
     def _merge_flows(self, biflows_ts_correction: bool) -> None:
         """
@@ -249,47 +361,130 @@ class StatisticalModel:
             Timestamps in reverse direction flows is corrected.
         """
 
-        assert len(self._ref.index) == self._ref.groupby(self.FLOW_KEY).ngroups, "Cannot merge flows, duplicated key."
+        assert (
+            len(self._ref.index) == self._ref.groupby(self.FLOW_KEY, sort=False).ngroups
+        ), "Cannot merge flows, duplicated key."
+
+        # factorize IP strings once (shared dictionary for both columns) and group on int32 codes
+        # instead of hashing object-dtype strings per row
+        ip_codes, ip_uniques = pd.factorize(
+            pd.concat((self._flows["SRC_IP"], self._flows["DST_IP"]), ignore_index=True), sort=False
+        )
+        flow_cnt = len(self._flows.index)
+        self._flows["SRC_IP_CODE"] = ip_codes[:flow_cnt]
+        self._flows["DST_IP_CODE"] = ip_codes[flow_cnt:]
+
+        grouped = self._flows.groupby(self.CODE_FLOW_KEY, sort=False, observed=True)
+        flows = grouped.aggregate(self.AGGREGATE_FLOWS)
+        flows["FLOW_COUNT"] = grouped.size()
+        flows = flows.reset_index()
 
-        flows = self._flows.groupby(self.FLOW_KEY).aggregate(self.AGGREGATE_FLOWS)
-        flows["FLOW_COUNT"] = self._flows.groupby(self.FLOW_KEY).size()
-        self._flows = flows.reset_index()
+        ip_values = ip_uniques.to_numpy()
+        flows["SRC_IP"] = ip_values[flows.pop("SRC_IP_CODE")]
+        flows["DST_IP"] = ip_values[flows.pop("DST_IP_CODE")]
+        self._flows = flows
 
         if biflows_ts_correction:
             # correct timestamps in reverse direction of flows originating from biflows
             # using direction invariant flow key
             flows = self._flows
 
-            swap_cond = flows["SRC_IP"] > flows["DST_IP"]
-            flows["INV_SRC_IP"] = np.where(swap_cond, flows["DST_IP"], flows["SRC_IP"])
-            flows["INV_DST_IP"] = np.where(swap_cond, flows["SRC_IP"], flows["DST_IP"])
-            flows["INV_SRC_PORT"] = np.where(swap_cond, flows["DST_PORT"], flows["SRC_PORT"])
-            flows["INV_DST_PORT"] = np.where(swap_cond, flows["SRC_PORT"], flows["DST_PORT"])
-
-            grouped = flows.groupby(self.DIR_INVARIANT_FLOW_KEY)
-            flows["START_TIME"] = grouped["START_TIME"].transform("min")
-            flows["END_TIME"] = grouped["END_TIME"].transform("max")
+            # swap both column pairs at once through 2D views instead of four np.where passes
+            swap_cond = (flows["SRC_IP"] > flows["DST_IP"]).to_numpy()
+            ip_pair = flows[["SRC_IP", "DST_IP"]].to_numpy()
+            port_pair = flows[["SRC_PORT", "DST_PORT"]].to_numpy()
+            ip_pair[swap_cond] = ip_pair[swap_cond][:, ::-1]
+            port_pair[swap_cond] = port_pair[swap_cond][:, ::-1]
+            flows[["INV_SRC_IP", "INV_DST_IP"]] = ip_pair
+            flows[["INV_SRC_PORT", "INV_DST_PORT"]] = port_pair
+
+            # one small per-group aggregation broadcast back via a single left-join
+            # instead of two independent transform passes over the grouper
+            grouped = flows.groupby(self.DIR_INVARIANT_FLOW_KEY, sort=False, observed=True)
+            corrected = grouped.agg(START_TIME=("START_TIME", "min"), END_TIME=("END_TIME", "max"))
+            flows = flows.drop(columns=["START_TIME", "END_TIME"]).merge(
+                corrected, left_on=self.DIR_INVARIANT_FLOW_KEY, right_index=True, how="left"
+            )
 
             self._flows = flows.loc[:, list(self.CSV_COLUMN_TYPES.keys()) + ["FLOW_COUNT"]]
 
-    def _convert_ip_addresses(self) -> None:
-        """Convert str ip addresses to objects (ipaddress library) in DataFrames."""
+    @staticmethod
+    def _ip_column_to_int(column: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Convert a column with IP addresses (strings or ipaddress objects) to fixed-width integer arrays.
+
+        IPv4 addresses are stored as uint32 value in the low limb, IPv6 addresses are split
+        into two uint64 limbs (high and low 64 bits).
+
+        Parameters
+        ----------
+        column : pd.Series
+            Column with IP addresses.
+
+        Returns
+        ------
+        tuple
+            high limbs (uint64), low limbs (uint64), IPv6 flags (bool)
+        """
+
+        hi = np.zeros(len(column), dtype=np.uint64)
+        lo = np.zeros(len(column), dtype=np.uint64)
+        is_v6 = np.zeros(len(column), dtype=bool)
+        for pos, value in enumerate(map(str, column)):
+            if ":" in value:
+                limbs = np.frombuffer(socket.inet_pton(socket.AF_INET6, value), dtype=">u8")
+                hi[pos], lo[pos] = limbs[0], limbs[1]
+                is_v6[pos] = True
+            else:
+                lo[pos] = np.frombuffer(socket.inet_pton(socket.AF_INET, value), dtype=">u4")[0]
+
+        return hi, lo, is_v6
+
+    def _convert_ip_addresses_to_int(self) -> None:
+        """Add cached integer representation of IP addresses to DataFrames.
+
+        Columns 'SRC_IP_INT_HI/LO/IS_V6' and 'DST_IP_INT_HI/LO/IS_V6' are used by the subnet filter
+        to test subnet membership with vectorized NumPy operations instead of per-row Python calls.
+        """
 
         if self._flows_ip_addresses_converted and self._ref_ip_addresses_converted:
             return
 
-        logging.getLogger().debug("Start applying ip_address...")
+        logging.getLogger().debug("Start converting IP addresses to integers...")
         start = time.time()
-        with PandasMultiprocessingHelper() as pool:
-            pool.apply(self._flows, [("SRC_IP", ipaddress.ip_address, []), ("DST_IP", ipaddress.ip_address, [])])
-            if not self._ref_ip_addresses_converted:
-                # convert to object only when reference is loaded from CSV file
-                pool.apply(self._ref, [("SRC_IP", ipaddress.ip_address, []), ("DST_IP", ipaddress.ip_address, [])])
+        for df, converted in ((self._flows, self._flows_ip_addresses_converted), (self._ref, self._ref_ip_addresses_converted)):
+            if converted:
+                continue
+            for column in ("SRC_IP", "DST_IP"):
+                # the IPv6 flag is kept per column - source and destination families
+                # are tested independently, a malformed row must not leak across them
+                df[f"{column}_INT_HI"], df[f"{column}_INT_LO"], df[f"{column}_IS_V6"] = self._ip_column_to_int(
+                    df[column]
+                )
         end = time.time()
-        logging.getLogger().debug("IP address applied in %.2f seconds.", (end - start))
+        logging.getLogger().debug("IP addresses converted in %.2f seconds.", (end - start))
 
         self._flows_ip_addresses_converted, self._ref_ip_addresses_converted = (True, True)
 
+    @classmethod
+    def _strip_ip_helper_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the cached integer IP columns from a frame.
+
+        The helper columns added by '_convert_ip_addresses_to_int' are an internal
+        detail of the subnet filter and must not leak into reported flows.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Flows possibly carrying the cached integer IP columns.
+
+        Returns
+        ------
+        pd.DataFrame
+            Flows restricted to the regular columns.
+        """
+
+        return df.drop(columns=[column for column in cls.IP_HELPER_COLUMNS if column in df.columns])
+
     def _filter_segment(
         self, segment: Optional[Union[SMSubnetSegment, SMTimeSegment]]
     ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
@@ -303,18 +498,50 @@ class StatisticalModel:
         Returns
         ------
         tuple
-            subset of flows acquired from the probe, subset of reference flows, used flows mask
+            subset of flows acquired from the probe, subset of reference flows,
+            used flows mask (None when the segment covers the whole data)
+        """
+
+        key = self._segment_key(segment)
+        cached = self._segment_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if isinstance(segment, SMSubnetSegment):
+            self._convert_ip_addresses_to_int()
+            result = self._filter_subnet_segment(segment)
+        elif isinstance(segment, SMTimeSegment):
+            result = self._filter_time_segment(segment)
+        else:
+            assert segment is None
+            # whole data - signalled with a None mask instead of an all-True array
+            result = (self._flows, self._ref, None)
+
+        self._segment_cache[key] = result
+        return result
+
+    @staticmethod
+    def _segment_key(segment: Optional[Union[SMSubnetSegment, SMTimeSegment]]) -> Optional[tuple]:
+        """Build a hashable key identifying the segment for the segment-mask cache.
+
+        Parameters
+        ----------
+        segment : SMSubnetSegment, SMTimeSegment, None
+            Segment to be used to create subsets.
+
+        Returns
+        ------
+        tuple or None
+            Cache key. None stands for the whole data.
         """
 
         if isinstance(segment, SMSubnetSegment):
-            self._convert_ip_addresses()
-            return self._filter_subnet_segment(segment)
+            return ("subnet", segment.source, segment.dest, segment.bidir)
 
         if isinstance(segment, SMTimeSegment):
-            return self._filter_time_segment(segment)
+            return ("time", segment.start, segment.end)
 
-        assert segment is None
-        return self._flows, self._ref, pd.Series([True] * self._flows.shape[0])
+        return None
 
     def _filter_subnet_segment(self, segment: SMSubnetSegment) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
         """Create subsets of data frames based on subnets.
@@ -333,57 +560,105 @@ class StatisticalModel:
         subnet_source = ipaddress.ip_network(segment.source) if segment.source is not None else None
         subnet_dest = ipaddress.ip_network(segment.dest) if segment.dest is not None else None
 
+        mask_flow = self._subnet_segment_mask(self._flows, segment, subnet_source, subnet_dest)
+        mask_ref = self._subnet_segment_mask(self._ref, segment, subnet_source, subnet_dest)
+
+        return (
+            self._flows[mask_flow].reset_index(drop=True),
+            self._ref[mask_ref].reset_index(drop=True),
+            mask_flow,
+        )
+
+    def _subnet_segment_mask(
+        self,
+        df: pd.DataFrame,
+        segment: SMSubnetSegment,
+        subnet_source: Optional[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]],
+        subnet_dest: Optional[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]],
+    ) -> np.ndarray:
+        """Build boolean mask of flows matching the subnet segment using vectorized integer comparisons.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Flows with cached integer IP columns.
+        segment : SMSubnetSegment
+            Segment to be used to create the mask.
+        subnet_source : ipaddress.IPv4Network, ipaddress.IPv6Network, None
+            Parsed source subnet.
+        subnet_dest : ipaddress.IPv4Network, ipaddress.IPv6Network, None
+            Parsed destination subnet.
+
+        Returns
+        ------
+        np.ndarray
+            Boolean mask of matching flows.
+        """
+
         if subnet_source is not None and subnet_dest is not None:
+            mask = self._mask_in_subnet(df, "SRC_IP", subnet_source) & self._mask_in_subnet(df, "DST_IP", subnet_dest)
             if segment.bidir:
-                mask_flow = (
-                    self._flows["SRC_IP"].apply(lambda x: x in subnet_source)
-                    & self._flows["DST_IP"].apply(lambda x: x in subnet_dest)
-                ) | (
-                    self._flows["SRC_IP"].apply(lambda x: x in subnet_dest)
-                    & self._flows["DST_IP"].apply(lambda x: x in subnet_source)
-                )
-                mask_ref = (
-                    self._ref["SRC_IP"].apply(lambda x: x in subnet_source)
-                    & self._ref["DST_IP"].apply(lambda x: x in subnet_dest)
-                ) | (
-                    self._ref["SRC_IP"].apply(lambda x: x in subnet_dest)
-                    & self._ref["DST_IP"].apply(lambda x: x in subnet_source)
-                )
-            else:
-                mask_flow = self._flows["SRC_IP"].apply(lambda x: x in subnet_source) & self._flows["DST_IP"].apply(
-                    lambda x: x in subnet_dest
-                )
-                mask_ref = self._ref["SRC_IP"].apply(lambda x: x in subnet_source) & self._ref["DST_IP"].apply(
-                    lambda x: x in subnet_dest
+                mask |= self._mask_in_subnet(df, "SRC_IP", subnet_dest) & self._mask_in_subnet(
+                    df, "DST_IP", subnet_source
                 )
         elif subnet_source is not None:
+            # non-inplace OR - memoized masks must not be mutated
+            mask = self._mask_in_subnet(df, "SRC_IP", subnet_source)
             if segment.bidir:
-                mask_flow = self._flows["SRC_IP"].apply(lambda x: x in subnet_source) | self._flows["DST_IP"].apply(
-                    lambda x: x in subnet_source
-                )
-                mask_ref = self._ref["SRC_IP"].apply(lambda x: x in subnet_source) | self._ref["DST_IP"].apply(
-                    lambda x: x in subnet_source
-                )
-            else:
-                mask_flow = self._flows["SRC_IP"].apply(lambda x: x in subnet_source)
-                mask_ref = self._ref["SRC_IP"].apply(lambda x: x in subnet_source)
+                mask = mask | self._mask_in_subnet(df, "DST_IP", subnet_source)
         else:
+            mask = self._mask_in_subnet(df, "DST_IP", subnet_dest)
             if segment.bidir:
-                mask_flow = self._flows["SRC_IP"].apply(lambda x: x in subnet_dest) | self._flows["DST_IP"].apply(
-                    lambda x: x in subnet_dest
-                )
-                mask_ref = self._ref["SRC_IP"].apply(lambda x: x in subnet_dest) | self._ref["DST_IP"].apply(
-                    lambda x: x in subnet_dest
-                )
-            else:
-                mask_flow = self._flows["DST_IP"].apply(lambda x: x in subnet_dest)
-                mask_ref = self._ref["DST_IP"].apply(lambda x: x in subnet_dest)
+                mask = mask | self._mask_in_subnet(df, "SRC_IP", subnet_dest)
 
-        return (
-            self._flows[mask_flow].reset_index(drop=True),
-            self._ref[mask_ref].reset_index(drop=True),
-            mask_flow,
-        )
+        return mask
+
+    def _mask_in_subnet(
+        self, df: pd.DataFrame, column: str, subnet: Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+    ) -> np.ndarray:
+        """Test subnet membership of an IP column as a masked integer compare '(ip & netmask) == network'.
+
+        Each (frame, column, subnet) membership mask is computed at most once and
+        memoized, so rules whose segments reuse a subnet (e.g. bidir variants)
+        share the scan.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Flows with cached integer IP columns.
+        column : str
+            Name of the IP column ('SRC_IP' or 'DST_IP').
+        subnet : ipaddress.IPv4Network or ipaddress.IPv6Network
+            Subnet to be tested.
+
+        Returns
+        ------
+        np.ndarray
+            Boolean mask of addresses belonging to the subnet.
+        """
+
+        key = (id(df), column, subnet)
+        cached = self._membership_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # restrict the kernel to rows of the subnet's IP family - the other
+        # family can never match, so its rows are not even scanned
+        is_v6 = df[f"{column}_IS_V6"].to_numpy()
+        family_rows = is_v6 if subnet.version == 6 else ~is_v6
+        mask = np.zeros(df.shape[0], dtype=bool)
+        if family_rows.any():
+            mask[family_rows] = in_subnet(
+                df[f"{column}_INT_HI"].to_numpy()[family_rows],
+                df[f"{column}_INT_LO"].to_numpy()[family_rows],
+                is_v6[family_rows],
+                int(subnet.network_address),
+                int(subnet.netmask),
+                subnet.version,
+            )
+
+        self._membership_cache[key] = mask
+        return mask
 
     def _filter_time_segment(self, segment: SMTimeSegment) -> Tuple[pd.DataFrame, pd.DataFrame, pd.Series]:
         """Create subsets of data frames based on time interval.
@@ -407,18 +682,14 @@ class StatisticalModel:
             end_time = int(segment.end.timestamp() * 1000)
 
         if start_time is not None and end_time is not None:
-            mask_flow = self._flows["START_TIME"].apply(lambda x: x >= start_time) & self._flows["END_TIME"].apply(
-                lambda x: x <= end_time
-            )
-            mask_ref = self._ref["START_TIME"].apply(lambda x: x >= start_time) & self._ref["END_TIME"].apply(
-                lambda x: x <= end_time
-            )
+            mask_flow = (self._flows["START_TIME"] >= start_time) & (self._flows["END_TIME"] <= end_time)
+            mask_ref = (self._ref["START_TIME"] >= start_time) & (self._ref["END_TIME"] <= end_time)
         elif start_time is not None:
-            mask_flow = self._flows["START_TIME"].apply(lambda x: x >= start_time)
-            mask_ref = self._ref["START_TIME"].apply(lambda x: x >= start_time)
+            mask_flow = self._flows["START_TIME"] >= start_time
+            mask_ref = self._ref["START_TIME"] >= start_time
         else:
-            mask_flow = self._flows["END_TIME"].apply(lambda x: x <= end_time)
-            mask_ref = self._ref["END_TIME"].apply(lambda x: x <= end_time)
+            mask_flow = self._flows["END_TIME"] <= end_time
+            mask_ref = self._ref["END_TIME"] <= end_time
 
         return (
             self._flows[mask_flow].reset_index(drop=True),
@@ -10,16 +10,37 @@ in case a replicator (ft-replay) was used as a generator during testing.
 
 from __future__ import annotations
 
-import ipaddress
 import logging
-import operator
 import re
+import socket
 from dataclasses import dataclass
-from typing import Any, Iterable, List, Optional, Union
+from fractions import Fraction
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from ftanalyzer.common.pandas_multiprocessing import PandasMultiprocessingHelper
+import pyarrow as pa
+import pyarrow.csv
+
+from ftanalyzer.replicator.replication_kernels import fill_loop_blocks
+
+# frozen Arrow schema and reader options shared by all replications; a large block
+# size keeps the reader multi-threaded over a handful of big chunks
+_ARROW_SCHEMA = pa.schema(
+    [
+        ("START_TIME", pa.uint64()),
+        ("END_TIME", pa.uint64()),
+        ("PROTOCOL", pa.uint8()),
+        ("SRC_IP", pa.string()),
+        ("DST_IP", pa.string()),
+        ("SRC_PORT", pa.uint16()),
+        ("DST_PORT", pa.uint16()),
+        ("PACKETS", pa.uint64()),
+        ("BYTES", pa.uint64()),
+    ]
+)
+_PA_READ_OPTS = pyarrow.csv.ReadOptions(use_threads=True, block_size=64 << 20)
+_PA_CONVERT_OPTS = pyarrow.csv.ConvertOptions(column_types=_ARROW_SCHEMA)
 
 
 class FlowReplicatorException(Exception):
@@ -113,6 +134,19 @@ class FlowReplicator:
     """
 
     FLOW_KEY = ["PROTOCOL", "SRC_IP", "DST_IP", "SRC_PORT", "DST_PORT"]
+    # flow key over the integer limb representation of IP addresses, ordered so that
+    # a lexicographic sort matches the original (PROTOCOL, SRC_IP, DST_IP, ports) order
+    INT_FLOW_KEY = [
+        "PROTOCOL",
+        "_SRC_IP_HI",
+        "_SRC_IP_LO",
+        "_DST_IP_HI",
+        "_DST_IP_LO",
+        "SRC_PORT",
+        "DST_PORT",
+        "_SRC_IP_V6",
+        "_DST_IP_V6",
+    ]
     CSV_COLUMN_TYPES = {
         "START_TIME": np.uint64,
         "END_TIME": np.uint64,
@@ -131,55 +165,6 @@ class FlowReplicator:
         "BYTES": "sum",
     }
 
-    class IPv6Address(ipaddress.IPv6Address):
-        """Custom representation of IPv6 address which edits only first 4 bytes when adding a number.
-        __lt__ can be performed over addresses with different versions (4 or 6).
-        Necessary for DataFrame grouping.
-        """
-
-        def __add__(self, other: int) -> FlowReplicator.IPv6Address:
-            if not isinstance(other, int):
-                return NotImplemented
-            added = int(self) + 2**96 * other
-            # overflow address
-            while added >= 2**128:
-                added -= 2**128
-            return self.__class__(added)
-
-        def __lt__(self, other):
-            if self._ip != other._ip:
-                return self._ip < other._ip
-            return False
-
-    class IPv4Address(ipaddress.IPv4Address):
-        """Custom representation of IPv4 address.
-        __lt__ can be performed over addresses with different versions (4 or 6).
-        Necessary for DataFrame grouping.
-        """
-
-        def __add__(self, other: int) -> FlowReplicator.IPv4Address:
-            if not isinstance(other, int):
-                return NotImplemented
-            added = int(self) + other
-            # overflow address
-            while added >= 2**32:
-                added -= 2**32
-            return self.__class__(added)
-
-        def __lt__(self, other):
-            if self._ip != other._ip:
-                return self._ip < other._ip
-            return False
-
-    @staticmethod
-    def ip_address(address: Any) -> Union[FlowReplicator.IPv6Address, FlowReplicator.IPv4Address]:
-        """Custom IP address parser. Custom IPv6Adress or IPv4Address object is returned."""
-
-        obj = ipaddress.ip_address(address)
-        if isinstance(obj, ipaddress.IPv6Address):
-            return FlowReplicator.IPv6Address(obj)
-        return FlowReplicator.IPv4Address(obj)
-
     def __init__(self, config: dict, ignore_loops: Optional[list[int]] = None) -> None:
         """Init flow replicator. Parse config dict.
 
@@ -201,6 +186,8 @@ class FlowReplicator:
         self._config = self._normalize_config(config)
         self._flows = None
         self._inactive_timeout = None
+        self._src_ip_int = None
+        self._dst_ip_int = None
 
     def replicate(
         self,
@@ -240,39 +227,137 @@ class FlowReplicator:
         """
 
         try:
-            self._flows = pd.read_csv(input_file, engine="pyarrow", dtype=self.CSV_COLUMN_TYPES)
+            # Arrow-native read keeps numeric columns in Arrow buffers and the IP
+            # columns as Arrow strings instead of per-row Python objects
+            self._flows = pyarrow.csv.read_csv(
+                input_file, read_options=_PA_READ_OPTS, convert_options=_PA_CONVERT_OPTS
+            ).to_pandas(types_mapper=pd.ArrowDtype)
         except Exception as err:
             raise FlowReplicatorException("Unable to read file with flows.") from err
 
-        with PandasMultiprocessingHelper() as pool:
-            pool.apply(self._flows, [("SRC_IP", self.ip_address, []), ("DST_IP", self.ip_address, [])])
+        # integer limb representation of source IP addresses, shared by all replicas
+        self._src_ip_int = self._ip_column_to_int(self._flows["SRC_IP"])
+        self._dst_ip_int = self._ip_column_to_int(self._flows["DST_IP"])
 
-            # index of source flow is used when merging flows within single loop
-            self._flows["ORIG_INDEX"] = self._flows.index
+        # index of source flow is used when merging flows within single loop;
+        # int32 is plenty for any input CSV and keeps sort keys and row lookups compact
+        self._flows["ORIG_INDEX"] = np.arange(len(self._flows.index), dtype=np.int32)
 
-            # transform speed to time multiplier
-            # e.g. time multiplier 0.5 corresponds to traffic played 2x faster
-            time_multiplier = 1 / speed_multiplier
+        # transform speed to time multiplier as an exact rational
+        # e.g. time multiplier 1/2 corresponds to traffic played 2x faster
+        time_multiplier = 1 / Fraction(speed_multiplier).limit_denominator(10**9)
 
-            # replicate and drop original record indexes - deduplicate
-            result = self._replicate(loops, time_multiplier)
-            result.reset_index(drop=True, inplace=True)
-            result.reindex()
+        # replicated frame is built over fresh preallocated columns with a plain range index
+        result = self._replicate(loops, time_multiplier)
 
-            pool.binary(
-                result,
-                [
-                    ("SRC_IP", operator.add, "SRC_IP", "_SRC_IP_OFFSET", []),
-                    ("DST_IP", operator.add, "DST_IP", "_DST_IP_OFFSET", []),
-                ],
-            )
+        self._apply_ip_offsets(result)
 
         if merge_across_loops:
             self._inactive_timeout = inactive_timeout * 1000 if inactive_timeout > -1 else None
             result = self._merge_across_loop(result)
 
+        # printable address form is materialized only once, at the very end
+        result["SRC_IP"] = self._ip_int_to_str(result["_SRC_IP_HI"], result["_SRC_IP_LO"], result["_SRC_IP_V6"])
+        result["DST_IP"] = self._ip_int_to_str(result["_DST_IP_HI"], result["_DST_IP_LO"], result["_DST_IP_V6"])
+
         return result.loc[:, self.CSV_COLUMN_TYPES.keys()]
 
+    @staticmethod
+    def _ip_column_to_int(column: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Convert a column with IP address strings to fixed-width integer arrays.
+
+        IPv4 addresses are stored as uint32 value in the low limb, IPv6 addresses are split
+        into two uint64 limbs (high and low 64 bits).
+
+        Parameters
+        ----------
+        column : pd.Series
+            Column with IP addresses.
+
+        Returns
+        -------
+        tuple
+            high limbs (uint64), low limbs (uint64), IPv6 flags (bool)
+        """
+
+        hi = np.zeros(len(column), dtype=np.uint64)
+        lo = np.zeros(len(column), dtype=np.uint64)
+        is_v6 = column.str.contains(":", regex=False).to_numpy(dtype=bool)
+
+        # parse each family in one batch: join the packed binary forms and view
+        # the concatenated buffer as fixed-width big-endian integers
+        if not is_v6.all():
+            lo[~is_v6] = np.frombuffer(b"".join(map(socket.inet_aton, column[~is_v6])), dtype=">u4")
+        if is_v6.any():
+            limbs = np.frombuffer(
+                b"".join(socket.inet_pton(socket.AF_INET6, value) for value in column[is_v6]), dtype=">u8"
+            ).reshape(-1, 2)
+            hi[is_v6] = limbs[:, 0]
+            lo[is_v6] = limbs[:, 1]
+
+        return hi, lo, is_v6
+
+    def _apply_ip_offsets(self, result: pd.DataFrame) -> None:
+        """Apply replication IP offsets to the integer address representation in one vectorized pass.
+
+        An IPv4 offset is added to the 32-bit value with wrap-around. An IPv6 offset is
+        added to the first 4 bytes of the address (ft-replay behavior), which is a shift
+        by 96 bits - an addition to the high limb with natural uint64 wrap-around.
+
+        Parameters
+        ----------
+        result : pd.DataFrame
+            Replicated flows with 'ORIG_INDEX' and '_SRC_IP_OFFSET'/'_DST_IP_OFFSET' columns.
+            Integer address columns are added to the frame.
+        """
+
+        orig_index = result["ORIG_INDEX"].to_numpy()
+        for prefix, (hi, lo, is_v6) in (("_SRC_IP", self._src_ip_int), ("_DST_IP", self._dst_ip_int)):
+            offset = result[f"{prefix}_OFFSET"].to_numpy().astype(np.uint64)
+            hi = hi[orig_index]
+            lo = lo[orig_index]
+            is_v6 = is_v6[orig_index]
+
+            result[f"{prefix}_HI"] = np.where(is_v6, hi + (offset << np.uint64(32)), hi)
+            result[f"{prefix}_LO"] = np.where(is_v6, lo, (lo + offset) & np.uint64(0xFFFFFFFF))
+            result[f"{prefix}_V6"] = is_v6
+
+    @staticmethod
+    def _ip_int_to_str(hi: pd.Series, lo: pd.Series, is_v6: pd.Series) -> np.ndarray:
+        """Convert the integer limb representation back to printable address strings.
+
+        Each unique (hi, lo, version) triple is formatted exactly once - replicated data
+        contains at most units * loops variants of every source address.
+
+        Parameters
+        ----------
+        hi : pd.Series
+            High 64 bits of the addresses.
+        lo : pd.Series
+            Low 64 bits of the addresses (uint32 value for IPv4).
+        is_v6 : pd.Series
+            IPv6 flags.
+
+        Returns
+        -------
+        np.ndarray
+            Address strings (object array).
+        """
+
+        packed = np.stack((hi.to_numpy(), lo.to_numpy(), is_v6.to_numpy().astype(np.uint64)), axis=1)
+        uniques, inverse = np.unique(packed, axis=0, return_inverse=True)
+
+        strings = np.empty(uniques.shape[0], dtype=object)
+        for pos, (addr_hi, addr_lo, v6_flag) in enumerate(uniques):
+            if v6_flag:
+                strings[pos] = socket.inet_ntop(
+                    socket.AF_INET6, int(addr_hi).to_bytes(8, "big") + int(addr_lo).to_bytes(8, "big")
+                )
+            else:
+                strings[pos] = socket.inet_ntoa(int(addr_lo).to_bytes(4, "big"))
+
+        return strings[inverse]
+
     @staticmethod
     def _parse_config_item(item: str, src_dict: dict) -> Optional[IpAddConstant]:
         """Parse single modifier in configuration. In replication unit section or loop section.
@@ -357,16 +442,28 @@ class FlowReplicator:
             self._parse_config_item("srcip", loop_config), self._parse_config_item("dstip", loop_config)
         )
 
+        # pre-bucket units by loop restriction so loop processing touches only units
+        # active in the given loop instead of scanning 'loop_only' of every unit;
+        # config position is kept to preserve the original unit order within a loop
+        self._units_always = []
+        self._units_by_loop = {}
+        for position, unit in enumerate(units):
+            if len(unit.loop_only) == 0:
+                self._units_always.append((position, unit))
+            else:
+                for loop_n in unit.loop_only:
+                    self._units_by_loop.setdefault(loop_n, []).append((position, unit))
+
         return ReplicatorConfig(units, loop)
 
-    def _replicate(self, loops: int, time_multiplier: float) -> pd.DataFrame:
+    def _replicate(self, loops: int, time_multiplier: Fraction) -> pd.DataFrame:
         """Replicate flows from source according to the configuration.
 
         Parameters
         ----------
         loops : int
             Number of replay loops.
-        time_multiplier : float
+        time_multiplier : Fraction
             Time multiplier propagated from replicate method.
 
         Returns
@@ -375,148 +472,151 @@ class FlowReplicator:
             Replicated flows.
         """
 
+        # scaling by the exact rational stays in uint64 throughout - no float64
+        # round-trip over the timestamp columns and no precision loss above 2^53
+        num = np.uint64(time_multiplier.numerator)
+        den = np.uint64(time_multiplier.denominator)
+
         loop_start = int(self._flows.loc[:, "START_TIME"].min())
         loop_end = int(self._flows.loc[:, "END_TIME"].max())
-        loop_length = int((loop_end - loop_start) * time_multiplier)
+        loop_length = (loop_end - loop_start) * int(num) // int(den)
+
+        # per-flow time deltas computed once as contiguous arrays
+        start = self._flows["START_TIME"].to_numpy()
+        end = self._flows["END_TIME"].to_numpy()
+        flow_lens = (end - start) * num // den
+        start_offsets = (start - np.uint64(loop_start)) * num // den
+
+        # per-loop IP offsets precomputed as int64 arrays (zero when no modifier)
+        loop_index = np.arange(loops, dtype=np.int64)
+        loop_src_offsets = loop_index * (self._config.loop.srcip.value if self._config.loop.srcip else 0)
+        loop_dst_offsets = loop_index * (self._config.loop.dstip.value if self._config.loop.dstip else 0)
+
+        # active replication units per processed loop, deduplicated by IP offset pair
+        loop_units = [
+            (loop_n, *self._active_unit_offsets(loop_n))
+            for loop_n in range(loops)
+            if loop_n not in self._ignore_loops
+        ]
 
-        self._flows["_FLOW_LEN"] = ((self._flows["END_TIME"] - self._flows["START_TIME"]) * time_multiplier).astype(
-            np.uint64
+        invariant = {
+            column: self._flows[column].to_numpy() for column in self.FLOW_KEY + ["PACKETS", "BYTES", "ORIG_INDEX"]
+        }
+        flow_count = len(self._flows.index)
+        unit_counts = np.fromiter(
+            (src_offsets.size for _, src_offsets, _, _ in loop_units), dtype=np.int64, count=len(loop_units)
         )
-        self._flows["_START_OFFSET"] = ((self._flows["START_TIME"] - loop_start) * time_multiplier).astype(np.uint64)
-
-        self._flows["_SRC_IP_OFFSET"] = 0
-        self._flows["_DST_IP_OFFSET"] = 0
+        total_rows = flow_count * int(unit_counts.sum())
+
+        # the exact output size is known up front - every loop writes its block
+        # straight into preallocated columns, no per-loop frames and no concat copy
+        out = {
+            "START_TIME": np.empty(total_rows, dtype=np.uint64),
+            "END_TIME": np.empty(total_rows, dtype=np.uint64),
+            **{column: np.empty(total_rows, dtype=values.dtype) for column, values in invariant.items()},
+            "_SRC_IP_OFFSET": np.empty(total_rows, dtype=np.int64),
+            "_DST_IP_OFFSET": np.empty(total_rows, dtype=np.int64),
+        }
+
+        if loop_units:
+            # timestamps and IP offsets of all loops are filled by a single kernel call;
+            # loop iterations are independent and write into disjoint output blocks
+            time_offsets = np.fromiter(
+                (loop_start + loop_n * loop_length for loop_n, _, _, _ in loop_units),
+                dtype=np.uint64,
+                count=len(loop_units),
+            )
+            unit_starts = np.zeros(unit_counts.size, dtype=np.int64)
+            np.cumsum(unit_counts[:-1], out=unit_starts[1:])
+            fill_loop_blocks(
+                start_offsets,
+                flow_lens,
+                time_offsets,
+                unit_starts * flow_count,
+                unit_starts,
+                unit_counts,
+                np.concatenate([loop_src_offsets[loop_n] + src for loop_n, src, _, _ in loop_units]),
+                np.concatenate([loop_dst_offsets[loop_n] + dst for loop_n, _, dst, _ in loop_units]),
+                out["START_TIME"],
+                out["END_TIME"],
+                out["_SRC_IP_OFFSET"],
+                out["_DST_IP_OFFSET"],
+            )
 
-        tmp_dataframes = []
-        for loop_n in range(loops):
+        row = 0
+        for loop_n, src_offsets, _, counts in loop_units:
             logging.getLogger().debug("Processing %d loop...", loop_n)
-            if loop_n in self._ignore_loops:
-                continue
-            tmp_dataframes.append(self._process_single_loop(loop_n, loop_start, loop_length))
+            block = slice(row, row + flow_count * src_offsets.size)
+            self._write_invariant_block(invariant, counts, out, block)
+            row = block.stop
 
-        res = pd.concat(tmp_dataframes, axis=0)
-        return res
+        return pd.DataFrame(out, copy=False)
 
-    def _process_single_loop(self, loop_n: int, global_start: int, loop_length: int) -> pd.DataFrame:
-        """Replicate flows for single loop. Copy, add time offset to timestamps and replicate with units.
+    def _active_unit_offsets(self, loop_n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Deduplicate the IP offset pairs of replication units active in the given loop.
 
         Parameters
         ----------
         loop_n : int
             Sequence number of loop.
-        global_start : int
-            Timestamp of first loop start.
-        loop_length : int
-            Duration of one loop in milliseconds.
 
         Returns
         -------
-        pd.DataFrame
-            Replicated flows (deep copy).
+        tuple
+            source IP offsets (int64), destination IP offsets (int64),
+            multiplicity of each offset pair (uint64)
         """
 
-        time_offset = global_start + loop_n * loop_length
-        srcip_offset = 0
-        dstip_offset = 0
-        if self._config.loop.srcip:
-            srcip_offset += loop_n * self._config.loop.srcip.value
-        if self._config.loop.dstip:
-            dstip_offset += loop_n * self._config.loop.dstip.value
-
-        flows = self._flows.copy()
-        flows["START_TIME"] = time_offset + flows["_START_OFFSET"]
-        flows["END_TIME"] = flows["START_TIME"] + flows["_FLOW_LEN"]
-
-        flows["_SRC_IP_OFFSET"] = flows["_SRC_IP_OFFSET"] + srcip_offset
-        flows["_DST_IP_OFFSET"] = flows["_DST_IP_OFFSET"] + dstip_offset
-
-        res = [
-            self._process_replication_unit(unit, flows)
-            for unit in self._config.units
-            if len(unit.loop_only) == 0 or loop_n in unit.loop_only
-        ]
-        res = pd.concat(res, axis=0)
+        multiplicity = {}
+        for _, unit in sorted(self._units_always + self._units_by_loop.get(loop_n, [])):
+            pair = (unit.srcip.value if unit.srcip else 0, unit.dstip.value if unit.dstip else 0)
+            multiplicity[pair] = multiplicity.get(pair, 0) + 1
 
-        # merge replicated flows with the same key within one loop
-        # (when replication unit does not change src nor dst ip)
-        # ORIG_INDEX - leave flows that are separated in input csv unmerged - expectation of correct reference
-        # (e.g. two flows with the same flow key at different times)
-        key = self.FLOW_KEY + ["ORIG_INDEX", "_SRC_IP_OFFSET", "_DST_IP_OFFSET"]
-        res = res.groupby(key, sort=False)
-        res = res.agg(self.AGGREGATE_SPLIT_FLOWS).reset_index()
-        res.reindex()
-        res.sort_values(by=["ORIG_INDEX"], inplace=True)
+        unit_count = len(multiplicity)
+        return (
+            np.fromiter((pair[0] for pair in multiplicity), dtype=np.int64, count=unit_count),
+            np.fromiter((pair[1] for pair in multiplicity), dtype=np.int64, count=unit_count),
+            np.fromiter(multiplicity.values(), dtype=np.uint64, count=unit_count),
+        )
 
-        return res
+    @staticmethod
+    def _write_invariant_block(invariant: dict, counts: np.ndarray, out: dict, block: slice) -> None:
+        """Broadcast the loop-invariant columns into one loop block of the output.
 
-    def _process_replication_unit(self, unit: ReplicatorUnit, orig_flows: pd.DataFrame) -> pd.DataFrame:
-        """Replicate flows by single replication unit within single loop.
+        Rows are ordered by (ORIG_INDEX, unit order) within the block, matching the former
+        groupby + sort. Writing through 2-D views of the preallocated columns broadcasts
+        each source array exactly once, with no intermediate per-loop frame.
 
         Parameters
         ----------
-        unit : ReplicatorUnit
-            Configuration of replication unit.
-        orig_flows : pd.DataFrame
-            Source flows with corrected timestamps and IP addresses according to the loop being processed.
-
-        Returns
-        -------
-        pd.DataFrame
-            Replicated flows (deep copy).
+        invariant : dict
+            Source columns which do not change across loops, as numpy arrays.
+        counts : np.ndarray
+            Multiplicity of each deduplicated offset pair (scales PACKETS and BYTES).
+        out : dict
+            Preallocated output columns.
+        block : slice
+            Row range of the output columns owned by this loop.
         """
 
-        flows = orig_flows.copy()
-        if unit.srcip:
-            flows["_SRC_IP_OFFSET"] = flows["_SRC_IP_OFFSET"] + unit.srcip.value
-        if unit.dstip:
-            flows["_DST_IP_OFFSET"] = flows["_DST_IP_OFFSET"] + unit.dstip.value
-        return flows
-
-    def _merge_func(self, group: pd.DataFrame) -> pd.DataFrame:
-        """Helper function used on group to merge flows across loops.
-
-        Parameters
-        ----------
-        group : pd.DataFrame
-            Grouped flows by flow key.
+        unit_count = counts.size
+        flow_count = invariant["ORIG_INDEX"].size
 
-        Returns
-        -------
-        pd.DataFrame
-            Merged flows.
-        """
-
-        # check if group has more than 1 flow (row)
-        if group.shape[0] > 1:
-            # drop original index, index within a group from 0
-            group.reset_index(drop=True, inplace=True)
-            group.reindex()
-
-            # create column with start time of following flow (shift by 1)
-            next_start = group["START_TIME"][1:]
-            next_start.reset_index(drop=True, inplace=True)
-            next_start.reindex()
-
-            group["GAP"] = next_start - group["END_TIME"]
-            group["AGGR_NO"] = 0
-
-            if self._inactive_timeout:
-                # split merge group when gap between flows are greater or equal inactive timeout
-                aggr_no = 0
-                for index, row in group.iterrows():
-                    group.at[index, "AGGR_NO"] = aggr_no
-                    if row["GAP"] >= self._inactive_timeout:
-                        aggr_no += 1
-
-            res_group = group.groupby(self.FLOW_KEY + ["AGGR_NO"]).aggregate(self.AGGREGATE_SPLIT_FLOWS).reset_index()
-            res_group.reindex()
-            return res_group
-        return group
+        for column, values in invariant.items():
+            out[column][block].reshape(flow_count, unit_count)[:] = values[:, None]
+        if counts.max(initial=1) > 1:
+            for column in ("PACKETS", "BYTES"):
+                out[column][block].reshape(flow_count, unit_count)[:] = invariant[column][:, None] * counts[None, :]
 
     def _merge_across_loop(self, flows: pd.DataFrame) -> pd.DataFrame:
         """Merge replicated flows across loops.
         Feature description is provided in FlowReplicator docstring.
 
+        Flows are sorted once by (flow key, START_TIME) and merged in a single segmented
+        reduction: a new output flow starts where the key changes or where the gap to the
+        previous flow reaches the inactive timeout. Aggregates are computed per segment
+        with 'np.ufunc.reduceat', avoiding a Python callback and 'iterrows' per group.
+
         Warning: merging does not take ORIG_INDEX into account, so if the source contains multiple flow records with
         the same flow key, the records will be merged.
 
@@ -531,4 +631,40 @@ class FlowReplicator:
             Merged flows.
         """
 
-        return flows.groupby(self.FLOW_KEY).apply(self._merge_func)
+        key_columns = [flows[column].to_numpy() for column in self.INT_FLOW_KEY]
+        start = flows["START_TIME"].to_numpy()
+
+        # primary sort by the flow key (last lexsort key is the most significant),
+        # ascending START_TIME within each key
+        order = np.lexsort((start,) + tuple(reversed(key_columns)))
+        key_columns = [column[order] for column in key_columns]
+        start = start[order]
+        end = flows["END_TIME"].to_numpy()[order]
+
+        # segment boundary on every key change and on every gap >= inactive timeout
+        boundaries = np.zeros(order.size, dtype=bool)
+        boundaries[0] = True
+        for column in key_columns:
+            boundaries[1:] |= column[1:] != column[:-1]
+        if self._inactive_timeout:
+            gap = start[1:].astype(np.int64) - end[:-1].astype(np.int64)
+            boundaries[1:] |= gap >= self._inactive_timeout
+
+        if boundaries.all():
+            # nothing to merge - every segment is a single flow, only the sort applies
+            merged = dict(zip(self.INT_FLOW_KEY, key_columns))
+            merged["START_TIME"] = start
+            merged["END_TIME"] = end
+            merged["PACKETS"] = flows["PACKETS"].to_numpy()[order]
+            merged["BYTES"] = flows["BYTES"].to_numpy()[order]
+            return pd.DataFrame(merged, copy=False)
+
+        segment_starts = np.flatnonzero(boundaries)
+        merged = {column: values[segment_starts] for column, values in zip(self.INT_FLOW_KEY, key_columns)}
+        # START_TIME is ascending within a segment, the first value is the minimum
+        merged["START_TIME"] = start[segment_starts]
+        merged["END_TIME"] = np.maximum.reduceat(end, segment_starts)
+        merged["PACKETS"] = np.add.reduceat(flows["PACKETS"].to_numpy()[order], segment_starts)
+        merged["BYTES"] = np.add.reduceat(flows["BYTES"].to_numpy()[order], segment_starts)
+
+        return pd.DataFrame(merged, copy=False)
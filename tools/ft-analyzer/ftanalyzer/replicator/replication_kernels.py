@@ -0,0 +1,151 @@
+"""
+Author(s): Jan Sobol <sobol@cesnet.cz>
+
+Copyright: (C) 2024 CESNET, z.s.p.o.
+SPDX-License-Identifier: BSD-3-Clause
+
+Kernel filling the per-loop timestamp and IP offset columns of replicated flows.
+
+Replay loops are independent and each one owns a disjoint slice of the preallocated
+output columns, so the fill is an embarrassingly parallel map over loops. When numba
+is installed, it runs as a JIT-compiled parallel loop which releases the GIL and
+scales across cores; otherwise a vectorized NumPy loop over the blocks is used.
+numba is an optional accelerator, not a project dependency.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+# pylint: disable=too-many-arguments
+def _fill_loop_blocks(
+    start_offsets: np.ndarray,
+    flow_lens: np.ndarray,
+    time_offsets: np.ndarray,
+    block_starts: np.ndarray,
+    unit_starts: np.ndarray,
+    unit_counts: np.ndarray,
+    src_offsets: np.ndarray,
+    dst_offsets: np.ndarray,
+    out_start: np.ndarray,
+    out_end: np.ndarray,
+    out_src: np.ndarray,
+    out_dst: np.ndarray,
+) -> None:
+    flow_count = start_offsets.size
+    # pylint: disable=not-an-iterable
+    for loop in prange(time_offsets.size):
+        row = block_starts[loop]
+        for flow in range(flow_count):
+            begin = start_offsets[flow] + time_offsets[loop]
+            finish = begin + flow_lens[flow]
+            for unit in range(unit_counts[loop]):
+                out_start[row] = begin
+                out_end[row] = finish
+                out_src[row] = src_offsets[unit_starts[loop] + unit]
+                out_dst[row] = dst_offsets[unit_starts[loop] + unit]
+                row += 1
+
+
+def _fill_loop_blocks_numpy(
+    start_offsets: np.ndarray,
+    flow_lens: np.ndarray,
+    time_offsets: np.ndarray,
+    block_starts: np.ndarray,
+    unit_starts: np.ndarray,
+    unit_counts: np.ndarray,
+    src_offsets: np.ndarray,
+    dst_offsets: np.ndarray,
+    out_start: np.ndarray,
+    out_end: np.ndarray,
+    out_src: np.ndarray,
+    out_dst: np.ndarray,
+) -> None:
+    flow_count = start_offsets.size
+    start_buf = np.empty_like(start_offsets)
+    end_buf = np.empty_like(flow_lens)
+    for loop in range(time_offsets.size):
+        np.add(start_offsets, time_offsets[loop], out=start_buf)
+        np.add(start_buf, flow_lens, out=end_buf)
+
+        count = int(unit_counts[loop])
+        block = slice(block_starts[loop], block_starts[loop] + flow_count * count)
+        units = slice(unit_starts[loop], unit_starts[loop] + count)
+        out_start[block].reshape(flow_count, count)[:] = start_buf[:, None]
+        out_end[block].reshape(flow_count, count)[:] = end_buf[:, None]
+        out_src[block].reshape(flow_count, count)[:] = src_offsets[units][None, :]
+        out_dst[block].reshape(flow_count, count)[:] = dst_offsets[units][None, :]
+
+
+if _NUMBA_AVAILABLE:
+    _fill_loop_blocks = njit(parallel=True, cache=True)(_fill_loop_blocks)
+
+
+def fill_loop_blocks(
+    start_offsets: np.ndarray,
+    flow_lens: np.ndarray,
+    time_offsets: np.ndarray,
+    block_starts: np.ndarray,
+    unit_starts: np.ndarray,
+    unit_counts: np.ndarray,
+    src_offsets: np.ndarray,
+    dst_offsets: np.ndarray,
+    out_start: np.ndarray,
+    out_end: np.ndarray,
+    out_src: np.ndarray,
+    out_dst: np.ndarray,
+) -> None:
+    """Fill timestamps and IP offsets of all replay loops into the preallocated output columns.
+
+    Rows of loop 'k' occupy 'block_starts[k] : block_starts[k] + flow_count * unit_counts[k]'
+    of the output arrays, ordered by (source flow, replication unit).
+
+    Parameters
+    ----------
+    start_offsets : np.ndarray
+        Per-flow start offsets from the loop start in milliseconds (uint64).
+    flow_lens : np.ndarray
+        Per-flow durations in milliseconds (uint64).
+    time_offsets : np.ndarray
+        Absolute start timestamp of each processed loop (uint64).
+    block_starts : np.ndarray
+        First output row of each processed loop (int64).
+    unit_starts : np.ndarray
+        Start of each loop's slice in 'src_offsets'/'dst_offsets' (int64).
+    unit_counts : np.ndarray
+        Number of replication units active in each processed loop (int64).
+    src_offsets : np.ndarray
+        Flattened source IP offsets of all (loop, unit) pairs (int64).
+    dst_offsets : np.ndarray
+        Flattened destination IP offsets of all (loop, unit) pairs (int64).
+    out_start : np.ndarray
+        Output START_TIME column (uint64).
+    out_end : np.ndarray
+        Output END_TIME column (uint64).
+    out_src : np.ndarray
+        Output source IP offset column (int64).
+    out_dst : np.ndarray
+        Output destination IP offset column (int64).
+    """
+
+    kernel = _fill_loop_blocks if _NUMBA_AVAILABLE else _fill_loop_blocks_numpy
+    kernel(
+        start_offsets,
+        flow_lens,
+        time_offsets,
+        block_starts,
+        unit_starts,
+        unit_counts,
+        src_offsets,
+        dst_offsets,
+        out_start,
+        out_end,
+        out_src,
+        out_dst,
+    )
@@ -18,6 +18,7 @@ from ftanalyzer.models import (
     SMSubnetSegment,
     SMTimeSegment,
 )
+from src.generator.interface import GeneratorStats
 
 BASE_PATH = os.path.dirname(os.path.realpath(__file__))
 FLOWS_PATH = os.path.join(BASE_PATH, "flows")
@@ -253,6 +254,33 @@ def test_subnet_segment_check_complement_fail():
     assert report.get_test("COMPLEMENT OF SEGMENTS").is_passing() is False
 
 
+def test_whole_data_check_complement():
+    """Test that a segment covering the whole data leaves an empty complement."""
+
+    stats = GeneratorStats(packets=0, bytes=0, start_time=0, end_time=0)
+    model = PMod(os.path.join(REF_PATH, "small.csv"), os.path.join(REF_PATH, "small.csv"), 300, stats)
+    segment = SMSubnetSegment(source="10.100.40.0/24", dest="37.187.104.0/24")
+    report = model.validate_precise([None, segment], check_complement=True)
+    report.print_results()
+
+    assert report.is_passing() is True
+    assert report.get_test("COMPLEMENT OF SEGMENTS").is_passing() is True
+
+
+def test_subnet_segment_converted_ips():
+    """Test that integer IP columns cached by the subnet filter do not leak into reported flows."""
+
+    stats = GeneratorStats(packets=0, bytes=0, start_time=0, end_time=0)
+    model = PMod(os.path.join(FLOWS_PATH, "small_missing.csv"), os.path.join(REF_PATH, "small.csv"), 300, stats)
+    segment = SMSubnetSegment(source="10.100.40.0/24", dest="37.187.104.0/24")
+    report = model.validate_precise([segment], check_complement=True)
+    report.print_results()
+
+    assert report.is_passing() is False
+    assert len(report.get_test(segment).missing) == 1
+    assert len(report.get_test("COMPLEMENT OF SEGMENTS").unexpected) == 3
+
+
 def test_subnet_time_segment_combination_check_complement():
     """Test dividing input data into segments by both subnet and time. Check that complement is empty."""
 
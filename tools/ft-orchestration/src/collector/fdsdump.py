@@ -9,9 +9,15 @@ Fdsdump iterates over entries in FDS file and return them as JSON/dict.
 
 import json
 import logging
+import tempfile
 import time
 from os import path
 
+import pyarrow as pa
+import pyarrow.compute
+import pyarrow.csv
+import pyarrow.parquet
+
 from lbr_testsuite.executable import (
     AsyncTool,
     ExecutableProcessError,
@@ -28,6 +34,21 @@ from src.common.tool_is_installed import assert_tool_is_installed
 FDSDUMP_CSV_FIELDS = "flowstart,flowend,proto,srcip,dstip,srcport,dstport,packets,bytes"
 ANALYZER_CSV_FIELDS = "START_TIME,END_TIME,PROTOCOL,SRC_IP,DST_IP,SRC_PORT,DST_PORT,PACKETS,BYTES"
 
+# column types used by ft-analyzer models, enforced when converting CSV to Parquet
+_ARROW_SCHEMA = pa.schema(
+    [
+        ("START_TIME", pa.uint64()),
+        ("END_TIME", pa.uint64()),
+        ("PROTOCOL", pa.uint8()),
+        ("SRC_IP", pa.string()),
+        ("DST_IP", pa.string()),
+        ("SRC_PORT", pa.uint16()),
+        ("DST_PORT", pa.uint16()),
+        ("PACKETS", pa.uint64()),
+        ("BYTES", pa.uint64()),
+    ]
+)
+
 
 class Fdsdump(CollectorOutputReaderInterface):
     """Iterate over entries in FDS file and return them as JSON/dict.
@@ -214,3 +235,32 @@ class Fdsdump(CollectorOutputReaderInterface):
         rsync.pull_path(tmp_file, path.dirname(csv_file))
         end = time.time()
         logging.getLogger().info("CSV output downloaded in %.2f seconds.", (end - start))
+
+    def save_parquet(self, parquet_file: str):
+        """Convert flows from FDS format to a Parquet file.
+
+        fdsdump emits only text formats, so the CSV output is produced and
+        downloaded first and then converted to typed Parquet locally. The file
+        is considerably smaller than the CSV and reading it back skips text
+        parsing entirely.
+
+        Parameters
+        ----------
+        parquet_file: str
+            Path to Parquet file. Local file, flows are downloaded when collector running on remote.
+        """
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_file = path.join(tmp_dir, path.basename(parquet_file).removesuffix(".parquet") + ".csv")
+            self.save_csv(csv_file)
+
+            start = time.time()
+            table = pyarrow.csv.read_csv(
+                csv_file, convert_options=pyarrow.csv.ConvertOptions(column_types=_ARROW_SCHEMA)
+            )
+            for port in ("SRC_PORT", "DST_PORT"):
+                index = table.schema.get_field_index(port)
+                table = table.set_column(index, port, pa.compute.fill_null(table.column(index), 0))
+            pyarrow.parquet.write_table(table, parquet_file)
+            end = time.time()
+            logging.getLogger().info("Parquet output converted in %.2f seconds.", (end - start))
@@ -270,6 +270,24 @@ class Ipfixcol2(CollectorInterface):
 
         self._process = None
 
+    def get_storage_size(self) -> int:
+        """Get current size of the flow storage directory in bytes.
+
+        Can be polled while the collector is running to detect that
+        all exported flows have been received and written.
+
+        Returns
+        -------
+        int
+            Size of the storage directory in bytes. 0 if the size cannot be determined.
+        """
+
+        stdout, _ = Tool(f"du -sb {self._log_dir}", executor=self._fallback_executor, failure_verbosity="silent").run()
+        try:
+            return int(stdout.split()[0])
+        except (IndexError, ValueError):
+            return 0
+
     def download_logs(self, directory: str):
         """Download logs from ipfixcol2 collector.
 
@@ -8,6 +8,7 @@ Base class for probe, generator and collector builder. Used by topology for cons
 """
 
 import datetime
+import functools
 import logging
 import pkgutil
 import shlex
@@ -33,6 +34,46 @@ class BuilderError(Exception):
     """Error while creating object via builder."""
 
 
+@functools.lru_cache(maxsize=None)
+def _resolve_class(module_paths: tuple[str, ...], class_name: str, interface: type):
+    """Walk packages in the given directories and import the class implementing the interface.
+
+    Results are cached - builders are constructed once per test scenario and
+    re-resolving the same connector type repeats the package walk and imports.
+
+    Parameters
+    ----------
+    module_paths : tuple[str, ...]
+        Paths to directories to search in.
+    class_name : str
+        Name of searched class.
+    interface : type
+        Interface which searched class must implement.
+
+    Returns
+    -------
+    interface type
+        Found and imported class.
+
+    Raises
+    ------
+    BuilderError
+        If class not found.
+    """
+
+    for finder, submodule_name, is_pkg in pkgutil.walk_packages(module_paths):
+        if is_pkg:
+            continue
+        submodule = finder.find_module(submodule_name).load_module(submodule_name)
+
+        if class_name in dir(submodule):
+            searched_class = getattr(submodule, class_name)
+            if issubclass(searched_class, interface):
+                return searched_class
+
+    raise BuilderError(f"Class '{class_name}' which implements '{interface.__name__}' not found.")
+
+
 class BuilderBase(ABC):
     """Base class for probe, generator and collector builder. It handles host creation and running ansible playbook."""
 
@@ -229,14 +270,4 @@ class BuilderBase(ABC):
             If class not found.
         """
 
-        for finder, submodule_name, is_pkg in pkgutil.walk_packages(module_paths):
-            if is_pkg:
-                continue
-            submodule = finder.find_module(submodule_name).load_module(submodule_name)
-
-            if class_name in dir(submodule):
-                searched_class = getattr(submodule, class_name)
-                if issubclass(searched_class, interface):
-                    return searched_class
-
-        raise BuilderError(f"Class '{class_name}' which implements '{interface.__name__}' not found.")
+        return _resolve_class(tuple(module_paths), class_name, interface)
@@ -7,6 +7,7 @@ SPDX-License-Identifier: BSD-3-Clause
 Functions with different purpose which can be utilized in testing scenarios.
 """
 
+import functools
 import ipaddress
 import logging
 import os
@@ -18,9 +19,12 @@ from src.config.scenario import ScenarioCfg, ScenarioCfgException, SimulationSce
 from yaml.scanner import ScannerError
 
 
+@functools.lru_cache(maxsize=None)
 def get_project_root() -> str:
     """General purpose function for getting the FlowTest root directory in ft-orchestration package.
 
+    The result is cached, repeated calls do not resolve the path again.
+
     Returns
     -------
     str
@@ -59,6 +63,8 @@ def get_replicator_prefix(
 ) -> int:
     """Determine the value for replicator prefix so that it does not overlap with provided configuration.
 
+    Results are cached, scenarios reusing the same generator ranges do not parse them again.
+
     Parameters
     ----------
     min_prefix: int
@@ -76,17 +82,34 @@ def get_replicator_prefix(
         Prefix which should be used in the replicator.
     """
 
+    # lists are unhashable, convert to tuples so that the result can be cached
+    if isinstance(ipv4_range, list):
+        ipv4_range = tuple(ipv4_range)
+    if isinstance(ipv6_range, list):
+        ipv6_range = tuple(ipv6_range)
+    return _get_replicator_prefix_cached(min_prefix, default_prefix, ipv4_range, ipv6_range)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_replicator_prefix_cached(
+    min_prefix: int,
+    default_prefix: int,
+    ipv4_range: Optional[Union[tuple[str, ...], str]],
+    ipv6_range: Optional[Union[tuple[str, ...], str]],
+) -> int:
+    """Cached implementation of 'get_replicator_prefix', range lists converted to tuples."""
+
     # range could be in form "<range> <probability>%", split by whitespace firstly
     if isinstance(ipv4_range, str):
         ipv4_prefix = int(ipv4_range.split()[0].split("/")[1])
-    elif isinstance(ipv4_range, list):
+    elif isinstance(ipv4_range, tuple):
         ipv4_prefix = min(int(r.split()[0].split("/")[1]) for r in ipv4_range)
     else:
         ipv4_prefix = 32
 
     if isinstance(ipv6_range, str):
         ipv6_prefix = int(ipv6_range.split()[0].split("/")[1])
-    elif isinstance(ipv6_range, list):
+    elif isinstance(ipv6_range, tuple):
         ipv6_prefix = min(int(r.split()[0].split("/")[1]) for r in ipv6_range)
     else:
         ipv6_prefix = 32
@@ -103,11 +126,13 @@ def get_replicator_prefix(
     return min_prefix
 
 
-def collect_scenarios(path: str, target: ScenarioCfg, name: Optional[str] = None) -> list["ParameterSet"]: # noqa
-    """
-    Collect all scenario files in the provided directory.
-    The function provides created configuration object and name of the respective scenario file.
-    To be used for parametrizing pytest test case to run the test case for every discovered scenario file.
+@functools.lru_cache(maxsize=None)
+def _load_scenario_files(path: str, target: ScenarioCfg) -> tuple:
+    """Load and check all scenario files in a directory, cached per (path, target).
+
+    Several test modules parametrize over the same scenario directory with
+    different scenario names - the YAML parsing is shared, only the cheap
+    per-name test selection is repeated by 'collect_scenarios'.
 
     Parameters
     ----------
@@ -115,35 +140,32 @@ def collect_scenarios(path: str, target: ScenarioCfg, name: Optional[str] = None
         Path to a directory where test are situated.
     target: ScenarioCfg
         Configuration class which inherits from ScenarioCfg class.
-    name: str, None
-        Name of the test scenario. Used for selecting tests for the specific scenario.
 
     Returns
     -------
-    list
-        List of ParameterSet objects to parametrize pytest test case.
+    tuple
+        Tuples (file, scenario, error); scenario is None when loading failed
+        and error holds the exception, otherwise error is None.
     """
 
     if not os.path.isdir(path):
         logging.getLogger().error("Path %s is not a directory", path)
-        return []
+        return ()
 
     try:
         files = [f for f in os.listdir(path) if ".yml" in f]
     except OSError as err:
         logging.getLogger().error("Unable to read directory content: %s, error: %s", path, err)
-        return []
+        return ()
 
-    tests = []
+    loaded = []
     for file in files:
         abspath = os.path.join(path, file)
         logging.getLogger().info("Loading test scenario from file: %s", abspath)
         try:
             scenario: SimulationScenario = target.from_yaml_file(abspath)
             scenario.check()
-            for test_cfg, test_marks, test_id in scenario.get_tests(file, name):
-                marks = [getattr(pytest.mark, mark) for mark in test_marks]
-                tests.append(pytest.param(test_cfg, test_id, marks=marks, id=test_id))
+            loaded.append((file, scenario, None))
         except (
             OSError,
             TypeError,
@@ -154,9 +176,47 @@ def collect_scenarios(path: str, target: ScenarioCfg, name: Optional[str] = None
             ScannerError,
         ) as err:
             logging.getLogger().error("Loading test scenario from file: %s, error: %s", abspath, err)
+            loaded.append((file, None, err))
+
+    return tuple(loaded)
+
+
+def collect_scenarios(path: str, target: ScenarioCfg, name: Optional[str] = None) -> list["ParameterSet"]: # noqa
+    """
+    Collect all scenario files in the provided directory.
+    The function provides created configuration object and name of the respective scenario file.
+    To be used for parametrizing pytest test case to run the test case for every discovered scenario file.
+    Scenario files are parsed once per directory and shared between callers.
+
+    Parameters
+    ----------
+    path : str
+        Path to a directory where test are situated.
+    target: ScenarioCfg
+        Configuration class which inherits from ScenarioCfg class.
+    name: str, None
+        Name of the test scenario. Used for selecting tests for the specific scenario.
+
+    Returns
+    -------
+    list
+        List of ParameterSet objects to parametrize pytest test case.
+    """
+
+    tests = []
+    for file, scenario, error in _load_scenario_files(path, target):
+        if error is not None:
             # We cannot mark test as failed at this point, therefore use skip.
-            marks = pytest.mark.skip(reason=f"ERROR: {err}, file: {abspath}")
+            marks = pytest.mark.skip(reason=f"ERROR: {error}, file: {os.path.join(path, file)}")
             tests.append(pytest.param(None, file, marks=marks, id=file.removesuffix(".yml")))
+            continue
+
+        for test_cfg, test_marks, test_id in scenario.get_tests(file, name):
+            marks = [getattr(pytest.mark, mark) for mark in test_marks]
+            # scenarios are independent, shard them across pytest-xdist workers
+            # (run with '-n auto --dist=loadgroup'); same-scenario runs serialize
+            marks.append(pytest.mark.xdist_group(name=test_id))
+            tests.append(pytest.param(test_cfg, test_id, marks=marks, id=test_id))
 
     return tests
 
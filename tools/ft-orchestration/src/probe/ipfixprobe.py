@@ -8,25 +8,29 @@ Library for managing ipfixprobe.
 """
 
 import logging
+import re
 import shutil
 import tempfile
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
+from itertools import chain
+
 from fabric import Connection
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from lbr_testsuite.executable import Daemon, Executor, Rsync, Tool, RemoteExecutor, LocalExecutor
 from src.common.required_field import required_field
-from src.common.tool_is_installed import assert_tool_is_installed
 from src.common.typed_dataclass import bool_convertor, typed_dataclass
 from src.config.common import InterfaceCfg
 from src.probe.interface import ProbeException, ProbeInterface
 from src.probe.probe_target import ProbeTarget
 from lbr_testsuite.executable import ExecutableProcessError
 
+LOGGER = logging.getLogger(__name__)
+
 PROTOCOLS_TO_PLUGINS = {
     "eth": "basic",
     "tcp": "basicplus",
@@ -97,6 +101,21 @@ FIELDS = {
 SPECIAL_FIELDS = {"dns_resp_rr": "OneInArray", "http_agent": "StartsWith"}
 
 
+class _SharedConnectionExecutor(RemoteExecutor):
+    """Remote executor bound to an already-opened fabric connection.
+
+    Reusing an authenticated session avoids a second SSH handshake when commands
+    are issued next to an executor which is busy with a running process.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, host: str, connection: Connection):
+        self._process = None
+        self._result = None
+        self._host = host
+        self._connection = connection
+
+
 class IpfixprobePluginType(Enum):
     """Basic types of plugins used by ipfixprobe."""
 
@@ -106,6 +125,14 @@ class IpfixprobePluginType(Enum):
     PROCESS = 3
 
 
+_PLUGIN_FLAG = {
+    IpfixprobePluginType.INPUT: "-i",
+    IpfixprobePluginType.OUTPUT: "-o",
+    IpfixprobePluginType.PROCESS: "-p",
+    IpfixprobePluginType.STORAGE: "-s",
+}
+
+
 @typed_dataclass
 @dataclass
 # pylint: disable=too-many-instance-attributes
@@ -256,49 +283,49 @@ class IpfixprobeStats:
         Output flow export stats.
     """
 
-    def __init__(self, stdout: List[str]) -> None:
+    def __init__(self, stdout: Iterable[str]) -> None:
         """Init stats object.
 
         Parameters
         ----------
-        stdout: list
-            Ipfixprobe process output splitted by lines.
+        stdout: iterable
+            Ipfixprobe process output lines, e.g. an open log file.
         """
 
         self.input = []
         self.output = []
         self._parse(stdout)
 
-    def _parse(self, stdout: List[str]) -> None:
-        """Parse from stdout.
+    def _parse(self, stdout: Iterable[str]) -> None:
+        """Parse from stdout. Input is consumed line by line, so the whole log
+        is never held in memory.
 
         Parameters
         ----------
-        stdout: list
-            Ipfixprobe process output splitted by lines.
+        stdout: iterable
+            Ipfixprobe process output lines, e.g. an open log file.
         """
 
         active_part = self.input
         active_columns = []
-        for line in [l.strip() for l in stdout]: # noqa
-            if "Input stats" in line:
+        for line in stdout:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("Input stats"):
                 active_part = self.input
                 continue
-            if "Output stats" in line:
+            if line.startswith("Output stats"):
                 active_part = self.output
                 continue
 
             cols = line.split()
-            if len(cols) > 0:
-                if cols[0] == "#":
-                    active_columns = []
-                    for column_name in cols[1:]:
-                        active_columns.append(column_name)
-                elif cols[0].isdigit():
-                    record = {}
-                    for i, col in enumerate(cols[1:]):
-                        record[active_columns[i]] = int(col) if col.isdigit() else col
-                    active_part.append(record)
+            if cols[0] == "#":
+                active_columns = cols[1:]
+            elif cols[0].isdigit():
+                active_part.append(
+                    {name: int(col) if col.isdigit() else col for name, col in zip(active_columns, cols[1:])}
+                )
 
     def __repr__(self) -> str:
         return f"INPUT:\n{self.input}\nOUTPUT:\n{self.output}"
@@ -367,8 +394,12 @@ class Ipfixprobe(ProbeInterface, ABC):
 
         self._executor = executor
         if isinstance(executor, RemoteExecutor):
+            # share the authenticated session instead of opening a second one; keepalive
+            # covers the idle period between start() and stop()
             connection: Connection = executor.get_connection()
-            self._fallback_executor = RemoteExecutor(executor.get_host(), **connection.connect_kwargs)
+            connection.open()
+            connection.transport.set_keepalive(30)
+            self._fallback_executor = _SharedConnectionExecutor(executor.get_host(), connection)
         else:
             self._fallback_executor = LocalExecutor()
         self._process = None
@@ -376,11 +407,20 @@ class Ipfixprobe(ProbeInterface, ABC):
         self._ifc_names = ",".join([ifc.name for ifc in interfaces])
         self._verbose = verbose
         self._enabled_plugins = []
+        self._required_plugins = []
+        self._preexisting_pids = None
         self._last_run_stats = None
         self._timeouts = (settings.active_timeout, settings.inactive_timeout)
 
-        assert_tool_is_installed("ipfixprobe", executor)
         self._cmd = self._prepare_cmd(target, protocols, settings)
+        self._binary_name = self._cmd.split(" ", 1)[0]
+        self._remote_preflight(self._required_plugins)
+
+        # enabled plugins are final once the command line is assembled - derive the
+        # field structures here so the accessors are plain O(1) copies
+        self._supported_fields = tuple(chain.from_iterable(FIELDS[p] for p in (*self._enabled_plugins, "basic")))
+        fields_set = frozenset(self._supported_fields)
+        self._special_fields = {name: value for name, value in SPECIAL_FIELDS.items() if name in fields_set}
 
         self._local_workdir = tempfile.mkdtemp()
         self._log_file = Path(self._local_workdir, "ipfixprobe.log")
@@ -394,8 +434,7 @@ class Ipfixprobe(ProbeInterface, ABC):
             Fields which may present in the flows.
         """
 
-        fields_2d = [FIELDS[p] for p in self._enabled_plugins + ["basic"]]
-        return [p for sub in fields_2d for p in sub]
+        return list(self._supported_fields)
 
     def get_special_fields(self) -> Dict[str, str]:
         """Get list of IPFIX fields the probe may export in its current configuration
@@ -407,23 +446,27 @@ class Ipfixprobe(ProbeInterface, ABC):
             of special fields with way to evaluate them
         """
 
-        fields = self.supported_fields()
-        return {name: value for name, value in SPECIAL_FIELDS.items() if name in fields}
+        return dict(self._special_fields)
 
     def start(self) -> None:
         """Start ipfixprobe process."""
 
-        logging.getLogger().info("Starting ipfixprobe exporter on %s.", self._ifc_names)
+        LOGGER.info("Starting ipfixprobe exporter on %s.", self._ifc_names)
         self._last_run_stats = None
 
         self._before_start()
 
-        # check and stop running ipfixprobe instance
-        check_running_cmd = "pidof 'ipfixprobe' 'ipfixprobed'"
-        running_processes = Tool(check_running_cmd, executor=self._executor, failure_verbosity="silent").run()[0]
-        if len(running_processes) > 0:
-            running_pid = int(running_processes.split()[0])
-            self._stop_process(running_pid)
+        # check and stop running ipfixprobe instance;
+        # the first start reuses the pid lookup done by the construction-time preflight
+        if self._preexisting_pids is None:
+            check_running_cmd = "pidof 'ipfixprobe' 'ipfixprobed'"
+            running_processes = Tool(check_running_cmd, executor=self._executor, failure_verbosity="silent").run()[0]
+            running_pids = [int(pid) for pid in running_processes.split()]
+        else:
+            running_pids = self._preexisting_pids
+            self._preexisting_pids = None
+        if len(running_pids) > 0:
+            self._stop_process(running_pids[0])
             time.sleep(2)
 
         self._process = Daemon(self._cmd, executor=self._executor, sudo=self._sudo)
@@ -439,7 +482,7 @@ class Ipfixprobe(ProbeInterface, ABC):
 
             # stderr is redirected to stdout
             err = res[0]
-            logging.getLogger().error(
+            LOGGER.error(
                 "Unable to start probe on %s. ipfixprobe return code: %d, error: %s",
                 self._ifc_names,
                 return_code,
@@ -454,10 +497,10 @@ class Ipfixprobe(ProbeInterface, ABC):
         if self._process is None:
             return
 
-        logging.getLogger().info("Stopping ipfixprobe exporter.")
+        LOGGER.info("Stopping ipfixprobe exporter.")
                
-        command = self._cmd.split(" ",1)[0]
-        Tool(f"kill $(pidof -s {command})", executor=self._fallback_executor, failure_verbosity="silent").run()
+        # pkill makes the pid lookup and the kill atomic, without a subshell
+        Tool(f"pkill -INT -x {self._binary_name}", executor=self._fallback_executor, failure_verbosity="silent").run()
         
         stdout = []
         try:
@@ -469,13 +512,13 @@ class Ipfixprobe(ProbeInterface, ABC):
             # stderr is redirected to stdout
             # Since stdout could be filled with normal output, print only last 1 line#
             err = stdout[-1]
-            logging.getLogger().error("ipfixprobe runtime error: %s, error: %s", self._process.returncode(), err)
+            LOGGER.error("ipfixprobe runtime error: %s, error: %s", self._process.returncode(), err)
             self._last_run_stats = None
             raise ProbeException("ipfixprobe runtime error")
 
+        # file objects iterate by line - no need to materialize the whole log
         with open(self._log_file, "r", encoding="utf-8") as file:
-            log = file.readlines()
-        self._last_run_stats = IpfixprobeStats(log)
+            self._last_run_stats = IpfixprobeStats(file)
         self._process = None
 
     def cleanup(self) -> None:
@@ -494,9 +537,12 @@ class Ipfixprobe(ProbeInterface, ABC):
         """
 
         try:
+            # the log lives in the local workdir even for a remote executor - Daemon
+            # streams the process output back to the orchestrator - so a plain local
+            # copy is correct here and no remote transfer is involved
             shutil.copy(self._log_file, directory)
         except PermissionError as err:
-            logging.getLogger().warning("Cannot download ipfixprobe log, %s", err)
+            LOGGER.warning("Cannot download ipfixprobe log, %s", err)
 
     @property
     def last_run_stats(self) -> Optional[IpfixprobeStats]:
@@ -521,24 +567,56 @@ class Ipfixprobe(ProbeInterface, ABC):
 
         return self._timeouts
 
-    def _check_plugin(self, name: str) -> None:
-        """Check plugin compiled in ipfixprobe binary by trying plugin's help.
+    def _require_plugin(self, name: str) -> None:
+        """Mark plugin as required. Presence of all required plugins in the ipfixprobe
+        binary is verified at once by the batched preflight check.
 
         Parameters
         ----------
         name : str
             Plugin name.
+        """
+
+        self._required_plugins.append(name)
+
+    def _remote_preflight(self, plugin_names: List[str]) -> None:
+        """Verify ipfixprobe installation with a single command on the host.
+
+        The binary lookup, the per-plugin help probes and the lookup of already running
+        ipfixprobe instances are batched into one shell invocation, so probe construction
+        costs a single round trip on a remote executor regardless of plugin count.
+
+        Parameters
+        ----------
+        plugin_names : list
+            Names of plugins which must be compiled in the ipfixprobe binary.
 
         Raises
         ------
+        RuntimeError
+            If the ipfixprobe binary is missing on the host.
         ProbeException
-            If plugin is not found.
+            If any of the required plugins is not found.
         """
 
-        check = Tool(f"ipfixprobe -h {name}", executor=self._executor, failure_verbosity="silent").run()
-        if check[0].strip() == f"No help available for {name}":
-            logging.getLogger().error("Plugin '%s' not found by ipfixprobe binary.", name)
-            raise ProbeException(f"Plugin '{name}' not found by ipfixprobe binary.")
+        script = "command -v ipfixprobe >/dev/null || { echo BINARY MISSING; exit 0; }; "
+        if plugin_names:
+            script += f'for p in {" ".join(plugin_names)}; do ipfixprobe -h "$p" 2>&1 | head -1; done; '
+        script += "echo PIDS $(pidof ipfixprobe ipfixprobed)"
+
+        stdout = Tool(script, executor=self._executor, failure_verbosity="silent").run()[0]
+
+        if "BINARY MISSING" in stdout:
+            LOGGER.error("ipfixprobe is missing on host %s", self._executor.get_host())
+            raise RuntimeError(f"ipfixprobe is missing on host {self._executor.get_host()}")
+
+        missing = re.search(r"No help available for (\S+)", stdout)
+        if missing:
+            LOGGER.error("Plugin '%s' not found by ipfixprobe binary.", missing.group(1))
+            raise ProbeException(f"Plugin '{missing.group(1)}' not found by ipfixprobe binary.")
+
+        pids = re.search(r"^PIDS(.*)$", stdout, re.MULTILINE)
+        self._preexisting_pids = [int(pid) for pid in pids.group(1).split()] if pids else []
 
     @abstractmethod
     def _prepare_cmd(self, target: ProbeTarget, protocols: List[str], settings: IpfixprobeSettings) -> str:
@@ -593,18 +671,12 @@ class Ipfixprobe(ProbeInterface, ABC):
             Plugin type flag and plugin params in string argument.
         """
 
-        if plugin_type == IpfixprobePluginType.INPUT:
-            flag = "-i"
-        elif plugin_type == IpfixprobePluginType.OUTPUT:
-            flag = "-o"
-        elif plugin_type == IpfixprobePluginType.PROCESS:
-            flag = "-p"
-        elif plugin_type == IpfixprobePluginType.STORAGE:
-            flag = "-s"
-        else:
-            raise ValueError("Not supported type of plugin.")
+        try:
+            flag = _PLUGIN_FLAG[plugin_type]
+        except KeyError as err:
+            raise ValueError("Not supported type of plugin.") from err
 
-        str_args = ";".join([plugin_name] + plugin_args)
+        str_args = ";".join(chain((plugin_name,), plugin_args))
 
         return (flag, f'"{str_args}"')
 
@@ -621,11 +693,6 @@ class Ipfixprobe(ProbeInterface, ABC):
         -------
         list
             Arguments to enable plugins.
-
-        Raises
-        ------
-        ProbeException
-            If any of required plugins is not found.
         """
 
         args = []
@@ -635,7 +702,7 @@ class Ipfixprobe(ProbeInterface, ABC):
         for plugin in sorted(plugins):
             if plugin == "basic":
                 continue
-            self._check_plugin(plugin)
+            self._require_plugin(plugin)
             args += self._get_plugin_arg(IpfixprobePluginType.PROCESS, plugin, [])
             self._enabled_plugins.append(plugin)
 
@@ -714,15 +781,18 @@ class Ipfixprobe(ProbeInterface, ABC):
     def _stop_process(self, pid):
         """Stop exporter process"""
 
-        Tool(f"kill -2 {pid}", executor=self._executor, failure_verbosity="silent", sudo=True).run()
-        ps_ec = Tool(f"ps -p {pid}", executor=self._executor, failure_verbosity="silent")
-        for _ in range(5):
-            ps_ec.run()
-            if ps_ec.returncode() == 1:
-                return
-            time.sleep(1)
-        logging.getLogger().warning("Unable to stop exporter process with SIGINT, using SIGKILL.")
-        Tool(f"kill -9 {pid}", executor=self._executor, failure_verbosity="silent", sudo=True).run()
+        # SIGINT, wait for exit (up to 5 s) and the conditional SIGKILL run as one
+        # command - a single round trip on a remote executor instead of a ps poll loop
+        stop_cmd = (
+            f"kill -2 {pid} 2>/dev/null; "
+            f"timeout 5 tail --pid={pid} -f /dev/null; "
+            f"if kill -0 {pid} 2>/dev/null; then echo SIGKILL; kill -9 {pid} 2>/dev/null; fi"
+        )
+        stdout = Tool(
+            f'sh -c "{stop_cmd}"', executor=self._executor, failure_verbosity="silent", sudo=True
+        ).run()[0]
+        if "SIGKILL" in stdout:
+            LOGGER.warning("Unable to stop exporter process with SIGINT, using SIGKILL.")
 
     def _before_start(self):
         """Do preparations before the probe start. Override this function in derived class."""
@@ -748,7 +818,7 @@ class IpfixprobeRaw(Ipfixprobe):
         self._mtu = mtu
 
     def _prepare_cmd(self, target: ProbeTarget, protocols: List[str], settings: IpfixprobeSettings) -> str:
-        self._check_plugin("raw")
+        self._require_plugin("raw")
 
         if not isinstance(settings, IpfixprobeRawSettings):
             raise TypeError("In IpfixprobeRaw settings should be IpfixprobeRawSettings.")
@@ -773,9 +843,12 @@ class IpfixprobeRaw(Ipfixprobe):
         return " ".join(args)
 
     def _before_start(self):
-        for ifc in self._ifc_names.split(","):
-            Tool(f"ip link set dev {ifc} up", executor=self._executor, sudo=True).run()
-            Tool(f"ip link set dev {ifc} mtu {self._mtu}", executor=self._executor, sudo=True).run()
+        # one invocation for all interfaces - a single round trip on a remote executor;
+        # the sh wrapper keeps the whole chain under one sudo
+        setup = " && ".join(
+            f"ip link set dev {ifc} up mtu {self._mtu}" for ifc in self._ifc_names.split(",")
+        )
+        Tool(f'sh -c "{setup}"', executor=self._executor, sudo=True).run()
 
 
 class IpfixprobeDpdk(Ipfixprobe):
@@ -798,7 +871,7 @@ class IpfixprobeDpdk(Ipfixprobe):
         super().__init__(executor, target, protocols, interfaces, verbose, settings, sudo)
 
     def _prepare_cmd(self, target: ProbeTarget, protocols: List[str], settings: IpfixprobeSettings) -> str:
-        self._check_plugin("dpdk")
+        self._require_plugin("dpdk")
 
         if not isinstance(settings, IpfixprobeDpdkSettings):
             raise TypeError("In IpfixprobeDpdk settings should be IpfixprobeDpdkSettings.")
@@ -829,8 +902,8 @@ class IpfixprobeDpdk(Ipfixprobe):
 
         args += self._get_plugin_arg(IpfixprobePluginType.INPUT, "dpdk", dpdk_params)
 
-        for _ in range(settings.queues_count - 1):
-            args += self._get_plugin_arg(IpfixprobePluginType.INPUT, "dpdk", [])
+        # the per-queue stanzas carry no arguments - repeat one prebuilt tuple
+        args += self._get_plugin_arg(IpfixprobePluginType.INPUT, "dpdk", []) * (settings.queues_count - 1)
 
         args += self._get_common_args(target, protocols, settings)
         return " ".join(args)
@@ -856,7 +929,7 @@ class IpfixprobeNdp(Ipfixprobe):
         self._mtu = mtu
 
     def _prepare_cmd(self, target: ProbeTarget, protocols: List[str], settings: IpfixprobeSettings) -> str:
-        self._check_plugin("ndp")
+        self._require_plugin("ndp")
 
         if not isinstance(settings, IpfixprobeNdpSettings):
             raise TypeError("In IpfixprobeNdp settings should be IpfixprobeNdpSettings.")
@@ -864,15 +937,17 @@ class IpfixprobeNdp(Ipfixprobe):
         args = ["ipfixprobe"]
 
         for dev_index, dev in enumerate(settings.devices):
-            mask = [int(bit) for bit in f"{settings.dma_channels_map[dev_index]:b}"[::-1]]
-            for i, bit in enumerate(mask):
-                if bit == 1:
-                    ndp_params = [f"dev={dev}:{i}"]
-                    args += self._get_plugin_arg(IpfixprobePluginType.INPUT, "ndp", ndp_params)
+            # walk only the set bits of the channel mask, no intermediate strings or lists
+            mask = settings.dma_channels_map[dev_index]
+            while mask:
+                channel = (mask & -mask).bit_length() - 1
+                args += self._get_plugin_arg(IpfixprobePluginType.INPUT, "ndp", [f"dev={dev}:{channel}"])
+                mask &= mask - 1
 
         args += self._get_common_args(target, protocols, settings)
         return " ".join(args)
 
     def _before_start(self):
-        for ifc in self._ifc_names.split(","):
-            Tool(f"nfb-eth -d {ifc} -L {self._mtu}", executor=self._executor).run()
+        # one invocation for all interfaces - a single round trip on a remote executor
+        setup = " && ".join(f"nfb-eth -d {ifc} -L {self._mtu}" for ifc in self._ifc_names.split(","))
+        Tool(setup, executor=self._executor).run()
@@ -1,11 +1,14 @@
 from pathlib import Path
 import logging
+import threading
 from src.probe.interface import ProbeInterface
-import time
 
 class Manual(ProbeInterface):
     """Empty implementation of ProbeInterface to allow manual setup or hardware flow exporter"""
 
+    # time to perform the manual action, tests may patch this to 0
+    COUNTDOWN_SECS = 10
+
     def __init__(
         self,
         executor,
@@ -19,36 +22,32 @@ class Manual(ProbeInterface):
         inactive_timeout,
         **kwargs,
     ):
-        self._timeouts = (active_timeout, inactive_timeout)
-    
+        # force ints so downstream timeout arithmetic stays integer-only
+        self._timeouts = (int(active_timeout), int(inactive_timeout))
+
     def start(self):
-        logging.warning("start probe now")
-        for i in range(10,-1,-1):
-            logging.info(i)
-            time.sleep(1)
-            
-    
+        logging.warning("start probe now, continuing in %d s", self.COUNTDOWN_SECS)
+        threading.Event().wait(self.COUNTDOWN_SECS)
+
+
     def supported_fields(self):
         pass
-    
+
     def get_special_fields(self):
         pass
-    
+
     def stop(self):
-        logging.warning("you can stop the probe now")
-        for i in range(10,-1,-1):
-            logging.info(i)
-            time.sleep(1)
-        
+        logging.warning("you can stop the probe now, continuing in %d s", self.COUNTDOWN_SECS)
+        threading.Event().wait(self.COUNTDOWN_SECS)
+
     def cleanup(self):
         pass
-    
+
     def download_logs(self, directory):
-        log_file = Path(directory, "manual.log")
-        open(log_file, "w").close()
-    
+        Path(directory, "manual.log").touch()
+
     def get_timeouts(self):
         return self._timeouts
-    
+
     def set_prefilter(self, ip_ranges):
         pass
@@ -7,6 +7,7 @@ SPDX-License-Identifier: BSD-3-Clause
 Builder for creating a probe instance based on a static configuration.
 """
 
+from functools import cached_property
 from os import path
 from typing import Any, Dict, List, Optional
 
@@ -111,11 +112,18 @@ class ProbeBuilder(BuilderBase, Device):
         additional_args = {**self._connector_args, **kwargs}
         if mtu is not None:
             additional_args.update({"mtu": mtu})
-            
-        protocols = list(set(protocols) & set(self.get_supported_protocols()))
+
+        # keep the caller's protocol order, set intersection would shuffle it
+        protocols = [protocol for protocol in protocols if protocol in self._supported_protocols]
 
         return self._class(self._executor, self._target, protocols, self._interfaces, **additional_args)
 
+    @cached_property
+    def _supported_protocols(self) -> frozenset:
+        """Supported protocols as a frozenset for O(1) membership checks, built on first use."""
+
+        return frozenset(self._protocols)
+
     def get_enabled_interfaces(self) -> List[InterfaceCfg]:
         """Get list of enabled interfaces.
 
@@ -185,16 +193,8 @@ class ProbeBuilder(BuilderBase, Device):
         if len(enabled_interfaces) == 0:
             return probe_cfg.interfaces
 
-        interfaces = []
-        for ifc in enabled_interfaces:
-            found = False
-            for ifc_cfg in probe_cfg.interfaces:
-                if ifc_cfg.name == ifc:
-                    interfaces.append(ifc_cfg)
-                    found = True
-                    break
-
-            if not found:
-                raise BuilderError(f"Interface '{ifc}' is not supported by probe '{probe_cfg.alias}'.")
-
-        return interfaces
+        by_name = {ifc_cfg.name: ifc_cfg for ifc_cfg in probe_cfg.interfaces}
+        try:
+            return [by_name[ifc] for ifc in enabled_interfaces]
+        except KeyError as err:
+            raise BuilderError(f"Interface '{err.args[0]}' is not supported by probe '{probe_cfg.alias}'.") from err
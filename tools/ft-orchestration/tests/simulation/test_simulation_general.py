@@ -8,24 +8,17 @@ General simulation test scenario. Replays traffic and performs evaluation.
 Allows to modify most of the configuration options.
 """
 
+from __future__ import annotations
+
+import functools
 import ipaddress
 import logging
 import os
-from typing import Optional
+import socket
+import struct
+from typing import TYPE_CHECKING, Optional
 
-import pandas as pd
 import pytest
-from ftanalyzer.models.precise_model import PreciseModel
-from ftanalyzer.models.sm_data_types import (
-    SMMetric,
-    SMMetricType,
-    SMRule,
-    SMSubnetSegment,
-)
-from ftanalyzer.models.statistical_model import StatisticalModel
-from ftanalyzer.replicator.flow_replicator import FlowReplicator
-from ftanalyzer.reports.precise_report import PreciseReport
-from ftanalyzer.reports.statistical_report import StatisticalReport
 from lbr_testsuite.topology.topology import select_topologies
 from src.collector.collector_builder import CollectorBuilder
 from src.common.html_report_plugin import HTMLReportData
@@ -42,6 +35,16 @@ from src.generator.generator_builder import GeneratorBuilder
 from src.generator.interface import GeneratorStats, MultiplierSpeed, Replicator
 from src.probe.probe_builder import ProbeBuilder
 
+# heavy analyzer and pandas imports are deferred into the functions which use them,
+# pytest collection of this module then does not pay for them
+if TYPE_CHECKING:
+    import pandas as pd
+    from ftanalyzer.replicator.flow_replicator import FlowReplicator
+    from ftanalyzer.reports.precise_report import PreciseReport
+    from ftanalyzer.reports.statistical_report import StatisticalReport
+
+LOGGER = logging.getLogger(__name__)
+
 PROJECT_ROOT = get_project_root()
 SIMULATION_TESTS_DIR = os.path.join(PROJECT_ROOT, "testing/simulation")
 select_topologies(["replicator"])
@@ -49,6 +52,37 @@ select_topologies(["replicator"])
 DEFAULT_REPLICATOR_PREFIX = 8
 
 
+@functools.lru_cache(maxsize=None)
+def _model_dispatch() -> dict:
+    """Evaluation model dispatch table, built on first use because analyzer imports are deferred.
+
+    Maps the analysis model name to the model class and the metric list used
+    with it (None means the metrics come from the scenario configuration).
+    """
+
+    from ftanalyzer.models.precise_model import PreciseModel
+    from ftanalyzer.models.sm_data_types import SMMetric, SMMetricType
+    from ftanalyzer.models.statistical_model import StatisticalModel
+
+    # precise model always expects zero faults
+    precise_metrics = tuple(
+        SMMetric(metric_type, 0)
+        for metric_type in (
+            SMMetricType.PACKETS,
+            SMMetricType.BYTES,
+            SMMetricType.FLOWS,
+            SMMetricType.PPS,
+            SMMetricType.MBPS,
+            SMMetricType.DURATION,
+        )
+    )
+
+    return {
+        "precise": (PreciseModel, precise_metrics),
+        "statistical": (StatisticalModel, None),
+    }
+
+
 def validate(
     analysis: AnalysisCfg,
     prefilter_conf: list[str],
@@ -84,8 +118,13 @@ def validate(
         precise report is present only if a precise model is selected.
     """
 
-    if analysis.model == "precise":
-        model = PreciseModel(flows_file, reference, active_timeout, stats, biflows)
+    from ftanalyzer.models.sm_data_types import SMRule, SMSubnetSegment
+
+    dispatch = _model_dispatch()
+    model_cls, precise_metrics = dispatch.get(analysis.model, dispatch["statistical"])
+
+    if precise_metrics is not None:
+        model = model_cls(flows_file, reference, active_timeout, stats, biflows)
         if len(prefilter_conf) > 0:
             precise_report = model.validate_precise(
                 [SMSubnetSegment(subnet, bidir=True) for subnet in prefilter_conf],
@@ -94,17 +133,9 @@ def validate(
         else:
             precise_report = model.validate_precise()
 
-        # precise model always expects zero faults
-        metrics = [
-            SMMetric(SMMetricType.PACKETS, 0),
-            SMMetric(SMMetricType.BYTES, 0),
-            SMMetric(SMMetricType.FLOWS, 0),
-            SMMetric(SMMetricType.PPS, 0),
-            SMMetric(SMMetricType.MBPS, 0),
-            SMMetric(SMMetricType.DURATION, 0),
-        ]
+        metrics = list(precise_metrics)
     else:
-        model = StatisticalModel(flows_file, reference, stats)
+        model = model_cls(flows_file, reference, stats)
         precise_report = None
         metrics = analysis.metrics
 
@@ -152,40 +183,56 @@ def setup_replicator(
         units and loops.
     """
 
+    import numpy as np
+    from ftanalyzer.replicator.flow_replicator import FlowReplicator
+
     assert loop_cnt > 0 and unit_cnt > 0
 
     prefix = get_replicator_prefix(
         (loop_cnt * unit_cnt - 1).bit_length(), DEFAULT_REPLICATOR_PREFIX, conf.ipv4.ip_range, conf.ipv6.ip_range
     )
     if conf.ipv4.ip_range is None:
-        conf.ipv4.ip_range = f"{ipaddress.IPv4Address(2 ** (32 - prefix)):s}/{prefix}"
+        # the value is a valid address by construction, skip IPv4Address validation
+        conf.ipv4.ip_range = f"{socket.inet_ntoa(struct.pack('>I', 1 << (32 - prefix)))}/{prefix}"
 
     if conf.ipv6.ip_range is None:
-        conf.ipv6.ip_range = f"{ipaddress.IPv6Address(2 ** (128 - prefix)):s}/{prefix}"
+        conf.ipv6.ip_range = f"{ipaddress.IPv6Address(1 << (128 - prefix)):s}/{prefix}"
 
-    extended_prefilter_conf = set()
+    unit_step = 1 << (32 - prefix)
 
     for unit_n in range(unit_cnt):
-        offset = unit_n * 2 ** (32 - prefix)
+        offset = unit_n * unit_step
         generator.add_replication_unit(
             srcip=Replicator.AddConstant(offset),
             dstip=Replicator.AddConstant(offset),
         )
-        for subnet in prefilter_conf:
-            extended_prefilter_conf.add(ip_network_add_offset(subnet, offset))
 
-    loop_offset = unit_cnt * 2 ** (32 - prefix)
+    loop_offset = unit_cnt * unit_step
     generator.set_loop_modifiers(srcip_offset=loop_offset, dstip_offset=loop_offset)
-    extended_prefilter_conf = {
-        ip_network_add_offset(subnet, loop_n * loop_offset)
-        for subnet in extended_prefilter_conf
-        for loop_n in range(loop_cnt)
-    }
 
-    logging.getLogger().info("Generator - ipv4 range: %s, ipv6 range: %s", conf.ipv4.ip_range, conf.ipv6.ip_range)
-    logging.getLogger().info("Replicator - units: %d, loops: %d, prefix: %d", unit_cnt, loop_cnt, prefix)
+    # single-pass expansion over all (unit, loop) combinations: an IPv4 offset is
+    # a plain integer addition, compute all offset addresses of a subnet in bulk
+    # instead of re-parsing the network per combination; IPv6 applies the offset
+    # to the upper 32 bits with overflow, keep the scalar path there
+    offsets = (np.arange(unit_cnt, dtype=np.uint64) * np.uint64(unit_step))[:, None] + np.arange(
+        loop_cnt, dtype=np.uint64
+    ) * np.uint64(loop_offset)
+    offsets = offsets.ravel()
+    extended_prefilter_conf = set()
+    add_offset = ip_network_add_offset  # local binding, avoids a global lookup per call
+    for subnet in map(ipaddress.ip_network, prefilter_conf):
+        if subnet.version == 4:
+            addresses = np.uint64(int(subnet.network_address)) + offsets
+            extended_prefilter_conf.update(
+                f"{ipaddress.IPv4Address(addr)}/{subnet.prefixlen}" for addr in addresses.tolist()
+            )
+        else:
+            extended_prefilter_conf.update(str(add_offset(subnet, offset)) for offset in offsets.tolist())
+
+    LOGGER.info("Generator - ipv4 range: %s, ipv6 range: %s", conf.ipv4.ip_range, conf.ipv6.ip_range)
+    LOGGER.info("Replicator - units: %d, loops: %d, prefix: %d", unit_cnt, loop_cnt, prefix)
 
-    return FlowReplicator(generator.get_replicator_config()), list(map(str, extended_prefilter_conf))
+    return FlowReplicator(generator.get_replicator_config()), list(extended_prefilter_conf)
 
 
 @pytest.mark.simulation